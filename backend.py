@@ -0,0 +1,49 @@
+import functools
+import importlib.util
+import os
+import sys
+
+PYTHON, NUMPY = 'python', 'numpy'
+BACKENDS = [ 'auto', PYTHON, NUMPY ]
+
+# set from $AOC_BACKEND or runner.py --backend; 'auto' picks by input size
+override = os.environ.get('AOC_BACKEND', 'auto')
+
+@functools.cache
+def numpy_available():
+    # checked without importing, so small inputs never pay for NumPy
+    return importlib.util.find_spec('numpy') is not None
+
+def choose(size, threshold, cold_threshold):
+    if override != 'auto':
+        return override
+    if 'numpy' not in sys.modules:
+        # the first NumPy call also pays for importing it
+        threshold = cold_threshold
+    return NUMPY if size >= threshold and numpy_available() else PYTHON
+
+def dispatch(threshold, cold_threshold, size=len):
+    # Decorates the pure-Python implementation; its vectorized twin registers
+    # with @fn.numpy, and can hand inputs that would overflow int64 back to
+    # fn.python. Each call measures its arguments with size() and uses
+    # NumPy from the threshold up, where it starts winning despite its setup,
+    # or from the higher cold threshold while NumPy is not imported yet.
+    def decorate(python):
+        implementations = { PYTHON: python }
+
+        @functools.wraps(python)
+        def dispatcher(*args, **kwargs):
+            backend = choose(size(*args, **kwargs), dispatcher.threshold, dispatcher.cold_threshold)
+            return implementations.get(backend, python)(*args, **kwargs)
+
+        def register(fn):
+            implementations[NUMPY] = fn
+            return fn
+
+        dispatcher.threshold = threshold
+        dispatcher.cold_threshold = cold_threshold
+        dispatcher.implementations = implementations
+        dispatcher.python = python
+        dispatcher.numpy = register
+        return dispatcher
+    return decorate
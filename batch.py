@@ -0,0 +1,98 @@
+#! /usr/bin/env python3
+
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import parallel
+import runner
+from cache import Cache
+
+Outcome = namedtuple('Outcome', ['day', 'path', 'answers', 'wall', 'error'])
+
+def warm_up(days):
+    # One process per core already: solves inside a worker stay serial, and
+    # native libraries are kept from adding threads of their own.
+    parallel.jobs = 1
+    for variable in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ.setdefault(variable, '1')
+    for day in days:
+        runner.load_day(day)
+
+def solve_file(day, path, cache=None):
+    start = time.perf_counter()
+    try:
+        with open(path) as f:
+            text = f.read()
+        stages = runner.solve(runner.load_day(day), text, cache=cache)
+    except Exception as e:
+        return Outcome(day, path, None, time.perf_counter() - start, f'{type(e).__name__}: {e}')
+    return Outcome(day, path, [ stage.result for stage in stages[1:] ], time.perf_counter() - start, None)
+
+def collect_tasks(days, root, single_dir):
+    tasks = []
+    for day in days:
+        directory = single_dir if single_dir is not None else os.path.join(root, f'day{day:02}')
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                tasks.append((day, path))
+    return tasks
+
+def run_batch(tasks, jobs, ordered=True, cache=None):
+    days = sorted(set(day for day, _ in tasks))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=warm_up, initargs=(days,)) as pool:
+        futures = [ pool.submit(solve_file, day, path, cache) for day, path in tasks ]
+        for future in (futures if ordered else as_completed(futures)):
+            yield future.result()
+
+def format_outcome(outcome):
+    if outcome.error is not None:
+        return f'day{outcome.day:02}\t{outcome.path}\tERROR\t{outcome.error}'
+    return f'day{outcome.day:02}\t{outcome.path}\t' + '\t'.join(map(str, outcome.answers))
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve many inputs per day on a pool of warm workers')
+    parser.add_argument('days', type=runner.parse_days,
+                        help='days to run, e.g. 5 or 1-25')
+    parser.add_argument('directory',
+                        help='directory of inputs for a single day, or with --all a root holding dayNN/ subdirectories')
+    parser.add_argument('-a', '--all', action='store_true',
+                        help='read inputs for each day from DIRECTORY/dayNN/')
+    parser.add_argument('-j', '--jobs', type=int, default=parallel.available_cpus(),
+                        help='worker processes shared by all days (default: %(default)s)')
+    parser.add_argument('-u', '--unordered', action='store_true',
+                        help='print results as they finish rather than in input order')
+    parser.add_argument('-c', '--cache', nargs='?', const='', metavar='DIR',
+                        help='reuse answers and parsed inputs cached on disk (default DIR: $AOC_CACHE_DIR or ~/.cache/advent2023)')
+    args = parser.parse_args()
+    cache = None if args.cache is None else Cache(args.cache)
+
+    if not args.all and len(args.days) != 1:
+        parser.error('a single input directory needs a single day; use --all for several days')
+
+    tasks = collect_tasks(args.days, args.directory, None if args.all else args.directory)
+    if not tasks:
+        parser.error(f'no input files found under {args.directory}')
+    start = time.perf_counter()
+    solved = failed = total_bytes = 0
+    for outcome in run_batch(tasks, args.jobs, ordered=not args.unordered, cache=cache):
+        print(format_outcome(outcome), flush=True)
+        if outcome.error is None:
+            solved += 1
+        else:
+            failed += 1
+        total_bytes += os.path.getsize(outcome.path)
+    elapsed = time.perf_counter() - start
+
+    print(f'{solved} solved, {failed} failed in {elapsed:.3f} s '
+          f'({len(tasks) / elapsed:.1f} files/s, {total_bytes / elapsed / 2**20:.2f} MiB/s, {args.jobs} workers)',
+          file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#! /usr/bin/env python3
+
+import argparse
+import importlib
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+
+import backend
+import generators
+import runner
+
+DEFAULT_SCALES = [ 0.5, 1, 2, 4 ]
+
+# days whose hot function dispatches between pure Python and NumPy
+BACKEND_DAYS = [ 2, 5, 6, 7, 8, 9, 11, 14, 24 ]
+CROSSOVER_SCALES = [ 0.05, 0.1, 0.25, 0.5, 1, 2, 4 ]
+
+# days whose dispatch threshold lies beyond the default crossover scales
+CROSSOVER_DAY_SCALES = {
+    5: [ 1, 2, 4, 8, 16, 32, 64 ],
+    6: [ 10, 25, 50, 75, 100, 150, 250 ] }
+
+# runs faster than this are dominated by timer noise and skew the fit
+MIN_FIT_SECONDS = 0.001
+
+def parse_scales(spec):
+    return [ float(scale) for scale in spec.split(',') ]
+
+def time_once(module, text):
+    try:
+        stages = runner.solve(module, text)
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
+    return { stage.name: { 'wall': stage.wall, 'cpu': stage.cpu } for stage in stages }, None
+
+def best_of(module, text, repeat):
+    best = None
+    for _ in range(repeat):
+        stages, error = time_once(module, text)
+        if error is not None:
+            return None, error
+        if best is None:
+            best = stages
+        else:
+            for name, times in stages.items():
+                for key in times:
+                    best[name][key] = min(best[name][key], times[key])
+    return best, None
+
+def total_wall(stages):
+    return sum(times['wall'] for times in stages.values())
+
+def scaling_exponent(runs, stage=None):
+    points = []
+    for run in runs:
+        if run.get('stages') is None:
+            continue
+        wall = total_wall(run['stages']) if stage is None else run['stages'][stage]['wall']
+        if wall >= MIN_FIT_SECONDS:
+            points.append((math.log(run['bytes']), math.log(wall)))
+    if len(points) < 2 or len(set(x for x, _ in points)) < 2:
+        return None
+    slope, _ = statistics.linear_regression(*zip(*points))
+    return slope
+
+def bench_day(day, scales, repeat, seed, max_seconds):
+    module = runner.load_day(day)
+    runs = []
+    for scale in scales:
+        text = generators.generate(day, scale, seed)
+        run = { 'scale': scale, 'size': generators.size_of(day, scale), 'bytes': len(text) }
+        run['stages'], error = best_of(module, text, repeat)
+        if error is not None:
+            run['error'] = error
+        runs.append(run)
+        if error is not None or total_wall(run['stages']) > max_seconds:
+            break
+    stage_names = next((list(run['stages']) for run in runs if run['stages'] is not None), [])
+    exponents = { name: scaling_exponent(runs, name) for name in stage_names }
+    exponents['total'] = scaling_exponent(runs)
+    return { 'runs': runs, 'exponent': exponents }
+
+def format_run(day, run):
+    if run['stages'] is None:
+        return f'day{day:02} x{run["scale"]:<6g} {run["bytes"]:>12} B  {run["error"]}'
+    walls = '  '.join(f'{name} {times["wall"] * 1000:10.3f} ms' for name, times in run['stages'].items())
+    return f'day{day:02} x{run["scale"]:<6g} {run["bytes"]:>12} B  {walls}'
+
+def format_exponent(exponent):
+    return 'n/a' if exponent is None else f'{exponent:.2f}'
+
+def run(args):
+    results = {
+        'python': sys.version,
+        'machine': platform.machine(),
+        'scales': args.scales,
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'days': { } }
+    for day in args.days:
+        result = bench_day(day, args.scales, args.repeat, args.seed, args.max_seconds)
+        for r in result['runs']:
+            print(format_run(day, r))
+        print(f'day{day:02} scaling exponent ' +
+              '  '.join(f'{name} {format_exponent(e)}' for name, e in result['exponent'].items()))
+        results['days'][str(day)] = result
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+def solve_wall(stages):
+    return sum(times['wall'] for name, times in stages.items() if name != 'parse')
+
+def crossover_input(day, scale, seed):
+    # Day 05 dispatches on the seed count, which its generator ties to the
+    # size of the maps, so only the seeds grow here, next to puzzle-sized maps.
+    if day == 5:
+        rng = random.Random(f'crossover:{day}:{scale}:{seed}')
+        return generators.gen_day05(generators.size_of(day, 1), rng, seed_pairs=generators.size_of(day, scale) // 4)
+    return generators.generate(day, scale, seed)
+
+def crossover(args):
+    # import NumPy up front so that no single run pays for it, and report
+    # its cost, which the dispatch thresholds for cold processes allow for
+    wall = time.perf_counter()
+    importlib.import_module('numpy')
+    print(f'numpy import {(time.perf_counter() - wall) * 1000:.1f} ms')
+
+    for day in args.days:
+        module = runner.load_day(day)
+        first_win = None
+        for scale in args.scales or CROSSOVER_DAY_SCALES.get(day, CROSSOVER_SCALES):
+            text = crossover_input(day, scale, args.seed)
+            walls, errors = { }, { }
+            for name in backend.BACKENDS:
+                backend.override = name
+                stages, error = best_of(module, text, args.repeat)
+                if error is None:
+                    walls[name] = solve_wall(stages)
+                else:
+                    errors[name] = error
+            backend.override = 'auto'
+            if errors:
+                print(f'day{day:02} x{scale:<6g} {len(text):>12} B  ' +
+                      '  '.join(f'{name} {error}' for name, error in errors.items()))
+                break
+            python, vectorized = walls[backend.PYTHON], walls[backend.NUMPY]
+            print(f'day{day:02} x{scale:<6g} {len(text):>12} B  ' +
+                  '  '.join(f'{name} {wall * 1000:10.3f} ms' for name, wall in walls.items()) +
+                  f'  numpy x{python / vectorized:.2f}')
+            if first_win is None and vectorized < python:
+                first_win = scale
+        print(f'day{day:02} numpy ' + ('never wins' if first_win is None else f'wins from x{first_win:g}'))
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    regressions = 0
+    for day, result in candidate['days'].items():
+        if day not in baseline['days']:
+            continue
+        old_runs = { r['scale']: r for r in baseline['days'][day]['runs'] }
+        for new in result['runs']:
+            old = old_runs.get(new['scale'])
+            if old is None or old['stages'] is None:
+                continue
+            if new['stages'] is None:
+                print(f'day{int(day):02} x{new["scale"]:<6g} ERROR    {new["error"]}')
+                regressions += 1
+                continue
+            for stage, times in new['stages'].items():
+                if stage not in old['stages']:
+                    continue
+                before, after = old['stages'][stage]['wall'], times['wall']
+                ratio = after / before if before > 0 else math.inf
+                flag = ''
+                if ratio > args.threshold and after - before > args.min_delta:
+                    flag = '  REGRESSION'
+                    regressions += 1
+                elif ratio < 1 / args.threshold:
+                    flag = '  improved'
+                if flag or args.verbose:
+                    print(f'day{int(day):02} x{new["scale"]:<6g} {stage:6} '
+                          f'{before * 1000:10.3f} ms -> {after * 1000:10.3f} ms  x{ratio:.2f}{flag}')
+        old_exponent = baseline['days'][day]['exponent'].get('total')
+        new_exponent = result['exponent'].get('total')
+        if old_exponent is not None and new_exponent is not None and new_exponent - old_exponent > args.exponent_slack:
+            print(f'day{int(day):02} scaling exponent {old_exponent:.2f} -> {new_exponent:.2f}  REGRESSION')
+            regressions += 1
+
+    print(f'{regressions} regression(s)')
+    return 1 if regressions else 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark solutions on scaled synthetic inputs')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='time every stage across input scales')
+    run_parser.add_argument('days', nargs='?', type=runner.parse_days, default=list(runner.DAYS))
+    run_parser.add_argument('-s', '--scales', type=parse_scales, default=DEFAULT_SCALES,
+                            help='comma-separated multiples of the puzzle-sized input (default: 0.5,1,2,4)')
+    run_parser.add_argument('-r', '--repeat', type=int, default=3,
+                            help='keep the best of this many runs (default: %(default)s)')
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--max-seconds', type=float, default=60,
+                            help='skip larger scales for a day once one run takes this long (default: %(default)s)')
+    run_parser.add_argument('-o', '--output', default='bench.json')
+
+    compare_parser = commands.add_parser('compare', help='flag regressions between two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--threshold', type=float, default=1.2,
+                                help='slowdown ratio that counts as a regression (default: %(default)s)')
+    compare_parser.add_argument('--min-delta', type=float, default=0.001,
+                                help='ignore slowdowns smaller than this many seconds (default: %(default)s)')
+    compare_parser.add_argument('--exponent-slack', type=float, default=0.2,
+                                help='allowed growth of the scaling exponent (default: %(default)s)')
+    compare_parser.add_argument('-v', '--verbose', action='store_true')
+
+    crossover_parser = commands.add_parser('crossover', help='time the Python and NumPy backends against each other')
+    crossover_parser.add_argument('days', nargs='?', type=runner.parse_days, default=BACKEND_DAYS)
+    crossover_parser.add_argument('-s', '--scales', type=parse_scales,
+                                  help='comma-separated multiples of the puzzle-sized input (default: per day, else '
+                                       + ','.join(map(str, CROSSOVER_SCALES)) + ')')
+    crossover_parser.add_argument('-r', '--repeat', type=int, default=3,
+                                  help='keep the best of this many runs (default: %(default)s)')
+    crossover_parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    elif args.command == 'crossover':
+        crossover(args)
+    else:
+        sys.exit(compare(args))
+
+if __name__ == '__main__':
+    main()
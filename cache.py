@@ -0,0 +1,105 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+# parsing faster than this is cheaper to redo than to unpickle
+MIN_PARSE_SECONDS = 0.01
+
+def default_directory():
+    if 'AOC_CACHE_DIR' in os.environ:
+        return os.environ['AOC_CACHE_DIR']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'advent2023')
+
+def source_file(value):
+    if hasattr(value, '__file__'):
+        return value.__file__
+    module = sys.modules.get(getattr(value, '__module__', None))
+    return getattr(module, '__file__', None)
+
+def local_sources(module):
+    # the module itself plus any sibling modules it uses, e.g. shared helpers
+    own = os.path.abspath(module.__file__)
+    sources = { own }
+    for value in vars(module).values():
+        path = source_file(value)
+        if path is not None and os.path.dirname(os.path.abspath(path)) == os.path.dirname(own):
+            sources.add(os.path.abspath(path))
+    return sorted(sources)
+
+class Cache:
+    versions = { }
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, min_parse_seconds=MIN_PARSE_SECONDS):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        self.min_parse_seconds = min_parse_seconds
+        os.makedirs(self.directory, exist_ok=True)
+
+    def solver_version(self, module):
+        # remembered per source file stamp, so that a long-lived process such
+        # as the daemon notices edits
+        sources = local_sources(module)
+        stamps = tuple((path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in sources)
+        if Cache.versions.get(module.__name__, (None,))[0] != stamps:
+            digest = hashlib.sha256(repr(sys.version_info[:2]).encode())
+            for path in sources:
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+            Cache.versions[module.__name__] = stamps, digest.hexdigest()
+        return Cache.versions[module.__name__][1]
+
+    def key(self, module, text):
+        digest = hashlib.sha256(self.solver_version(module).encode())
+        digest.update(text.encode())
+        return digest.hexdigest()
+
+    def path(self, key, kind):
+        return os.path.join(self.directory, f'{key}.{kind}')
+
+    def get(self, key, kind):
+        path = self.path(key, kind)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path)
+        return value
+
+    def put(self, key, kind, value):
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return False
+        fd, temp = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp, self.path(key, kind))
+        self.evict()
+        return True
+
+    def evict(self):
+        entries, total = [], 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.startswith('.tmp-'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
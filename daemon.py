@@ -0,0 +1,127 @@
+#! /usr/bin/env python3
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+# runner is only imported server-side; the client stays light enough to start
+# faster than running a day directly
+DAYS = range(1, 26)
+
+def default_socket_path():
+    if 'AOC_SOCKET' in os.environ:
+        return os.environ['AOC_SOCKET']
+    directory = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'
+    return os.path.join(directory, f'advent2023-{os.getuid()}.sock')
+
+def solve_text(day, data, cache=None):
+    import runner
+
+    try:
+        stages = runner.solve(runner.load_day(day), data.decode(), cache=cache)
+    except Exception as e:
+        return { 'error': f'{type(e).__name__}: {e}' }
+    return {
+        'answers': [ str(stage.result) for stage in stages[1:] ],
+        'stages': [ { 'name': stage.name, 'wall': stage.wall, 'cpu': stage.cpu } for stage in stages ] }
+
+def serve(path, jobs, cache=None):
+    # server-side imports stay here so the client starts as fast as possible
+    import multiprocessing
+    import signal
+    import socketserver
+
+    import batch
+    import runner
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            header = self.rfile.readline().split()
+            if not header:
+                return
+            try:
+                day, length = int(header[0]), int(header[1])
+                if day not in DAYS:
+                    raise ValueError(f'no such day: {day}')
+            except (IndexError, ValueError) as e:
+                response = { 'error': f'bad request: {e}' }
+            else:
+                response = pool.apply(solve_text, (day, self.rfile.read(length), cache))
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(path):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(path)
+            sys.exit(f'a daemon is already listening on {path}')
+        except ConnectionRefusedError:
+            os.unlink(path)
+
+    jobs = jobs or batch.available_cpus()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with multiprocessing.Pool(jobs, initializer=batch.warm_up, initargs=(DAYS,)) as pool:
+        with Server(path, Handler) as server:
+            print(f'listening on {path} with {jobs} workers', file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.unlink(path)
+
+def format_stage(stage):
+    # the layout of runner.format_stage, without importing runner
+    return f'  {stage["name"]:6} wall {stage["wall"] * 1000:10.3f} ms  cpu {stage["cpu"] * 1000:10.3f} ms'
+
+def request(path, day, data):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(f'{day} {len(data)}\n'.encode() + data)
+        with client.makefile('rb') as response:
+            return json.loads(response.readline())
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep every day loaded in a long-running solver daemon')
+    parser.add_argument('-s', '--socket', default=default_socket_path(),
+                        help='Unix socket path (default: $AOC_SOCKET or %(default)s)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='preload all days and answer requests')
+    serve_parser.add_argument('-j', '--jobs', type=int,
+                              help='worker processes (default: one per available CPU)')
+    serve_parser.add_argument('-c', '--cache', nargs='?', const='', metavar='DIR',
+                              help='reuse answers and parsed inputs cached on disk (default DIR: $AOC_CACHE_DIR or ~/.cache/advent2023)')
+
+    solve_parser = commands.add_parser('solve', help='solve an input on a running daemon')
+    solve_parser.add_argument('day', type=int, choices=DAYS, metavar='DAY')
+    solve_parser.add_argument('input', nargs='?', help='input file (default: stdin)')
+    solve_parser.add_argument('-t', '--timing', action='store_true',
+                              help='report wall and CPU time per stage')
+
+    args = parser.parse_args()
+    if args.command == 'serve':
+        from cache import Cache
+        serve(args.socket, args.jobs, None if args.cache is None else Cache(args.cache))
+        return
+
+    if args.input is None:
+        data = sys.stdin.buffer.read()
+    else:
+        with open(args.input, 'rb') as f:
+            data = f.read()
+    response = request(args.socket, args.day, data)
+    if 'error' in response:
+        sys.exit(response['error'])
+    for part, answer in enumerate(response['answers'], 1):
+        print(f'Part {part}: {answer}')
+    if args.timing:
+        for stage in response['stages']:
+            print(format_stage(stage))
+
+if __name__ == '__main__':
+    main()
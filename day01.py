@@ -1,29 +1,62 @@
 #! /usr/bin/env python3
 
 import fileinput
+import functools
+import re
 
 WORDS = [
     'zero', 'one', 'two', 'three', 'four',
     'five', 'six', 'seven', 'eight', 'nine' ]
 
-def digit(s):
-    return int(s[0]) if s[0].isdigit() else None
-
-def word(s):
-    return next((n for n, word in enumerate(WORDS) if s.startswith(word)), None)
-
-def digit_or_word(s):
-    return digit(s) or word(s)
-
-def calibration_value(line, convert):
-    conversions = (convert(line[i:]) for i in range(len(line)))
-    digits = [ d for d in conversions if d is not None ]
-    return digits[0] * 10 + digits[-1]
-
-def solve(lines, convert):
-    return sum(calibration_value(line, convert) for line in lines)
-
-lines = [ line.strip() for line in fileinput.input() ]
-
-print(f'Part 1: {solve(lines, digit)}')
-print(f'Part 2: {solve(lines, digit_or_word)}')
+# One match call finds all four ends of a line, one per capture: the first
+# and last digit, then the first and last digit or word. The last ones come
+# from a .* that backtracks from the end of the line, so overlapping words
+# like 'oneight' still end in 'eight'. A '0' digit counts on its own, but
+# not among words, where 'zero' does.
+TOKEN = '|'.join(WORDS) + '|[1-9]'
+ENDS = re.compile(rf'(?=\D*(\d))(?=.*(\d))(?=.*?({TOKEN})).*({TOKEN})')
+VALUES = { str(n): n for n in range(10) } | { word: n for n, word in enumerate(WORDS) }
+
+def calibration_values(line):
+    first_digit, last_digit, first_token, last_token = ENDS.match(line).groups()
+    return int(first_digit + last_digit), VALUES[first_token] * 10 + VALUES[last_token]
+
+@functools.lru_cache(maxsize=1)
+def solve(lines):
+    # both parts from the same scan; the second part reuses the first's
+    part1 = part2 = 0
+    for digits, tokens in map(calibration_values, lines):
+        part1 += digits
+        part2 += tokens
+    return part1, part2
+
+def solve_part1(lines):
+    return solve(lines)[0]
+
+def solve_part2(lines):
+    return solve(lines)[1]
+
+class Accumulator:
+    # both parts' calibration sums, one line at a time
+    def __init__(self):
+        self.part1 = self.part2 = 0
+
+    def feed(self, lines):
+        for line in lines:
+            line = line.decode().strip()
+            if line:
+                part1, part2 = calibration_values(line)
+                self.part1 += part1
+                self.part2 += part2
+
+    def answers(self):
+        return self.part1, self.part2
+
+def parse(text):
+    return tuple(line.strip() for line in text.splitlines())
+
+if __name__ == '__main__':
+    lines = parse(''.join(fileinput.input()))
+
+    print(f'Part 1: {solve_part1(lines)}')
+    print(f'Part 2: {solve_part2(lines)}')
@@ -2,52 +2,134 @@
 
 import fileinput
 import re
-from collections import defaultdict
-from functools import reduce
-
-class RGB:
-    def __init__(self, r=0, g=0, b=0):
-        self.R, self.G, self.B = r, g, b
-
-    def power(self):
-        return self.R * self.G * self.B
-
-    def any_greater(self, rgb):
-        return self.R > rgb.R or self.G > rgb.G or self.B > rgb.B
-
-    def max(self, rgb):
-        return RGB(max(self.R, rgb.R), max(self.G, rgb.G), max(self.B, rgb.B))
+from array import array
+
+import backend
+import tokens
+
+LIMIT = (12, 13, 14)
+
+class Games:
+    # Columnar draws: draw j showed red[j], green[j] and blue[j] cubes, and
+    # game i, numbered ids[i], owns draws offsets[i]:offsets[i + 1]. Columns
+    # are int64 arrays that NumPy can view without copying.
+    def __init__(self):
+        self.ids = array('q')
+        self.offsets = array('q', [ 0 ])
+        self.red, self.green, self.blue = array('q'), array('q'), array('q')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, id, draws):
+        self.ids.append(id)
+        for r, g, b in draws:
+            self.red.append(r)
+            self.green.append(g)
+            self.blue.append(b)
+        self.offsets.append(len(self.red))
+
+    def columns(self):
+        return self.red, self.green, self.blue
+
+def draw_count(games, limits=None):
+    return len(games.red)
+
+def game_maxima(games):
+    # per-game (red, green, blue) maxima as three lists
+    bounds = list(zip(games.offsets, games.offsets[1:]))
+    return [ [ max(column[lo:hi]) for lo, hi in bounds ] for column in games.columns() ]
+
+def game_maxima_numpy(games):
+    # segmented reduction: one maximum per run of draws starting at each offset
+    import numpy as np
+
+    starts = np.frombuffer(games.offsets, dtype=np.int64)[:-1]
+    return np.stack([ np.maximum.reduceat(np.frombuffer(column, dtype=np.int64), starts)
+                      for column in games.columns() ])
+
+@backend.dispatch(threshold=100, cold_threshold=30000, size=draw_count)
+def possible_id_sums(games, limits):
+    # for each (red, green, blue) limit, the ids of games whose draws all fit
+    red, green, blue = game_maxima(games)
+    return [ sum(id for id, r, g, b in zip(games.ids, red, green, blue)
+                 if r <= red_limit and g <= green_limit and b <= blue_limit)
+             for red_limit, green_limit, blue_limit in limits ]
+
+@possible_id_sums.numpy
+def possible_id_sums_numpy(games, limits):
+    import numpy as np
+
+    if not len(games):
+        return [ 0 ] * len(limits)
+    maxima = game_maxima_numpy(games)
+    limits = np.array(limits, dtype=np.int64).reshape(-1, 3)
+    possible = (maxima[None, :, :] <= limits[:, :, None]).all(axis=1)
+    ids = np.frombuffer(games.ids, dtype=np.int64)
+    # sums of ids taken in Python, so a large id column cannot overflow
+    return [ sum(ids[row].tolist()) for row in possible ]
+
+@backend.dispatch(threshold=100, cold_threshold=30000, size=draw_count)
+def power_sum(games):
+    red, green, blue = game_maxima(games)
+    return sum(r * g * b for r, g, b in zip(red, green, blue))
+
+@power_sum.numpy
+def power_sum_numpy(games):
+    if not len(games):
+        return 0
+    maxima = game_maxima_numpy(games)
+    if int(maxima.max()) >= 2**21:
+        # a product of three maxima could pass int64
+        return power_sum.python(games)
+    return sum(maxima.prod(axis=0).tolist())
 
 def solve_part1(games):
-    limit = RGB(12, 13, 14)
+    return possible_id_sums(games, [ LIMIT ])[0]
 
-    def over_limit(game):
-        return any(rgb for rgb in game if rgb.any_greater(limit))
+def solve_part2(games):
+    return power_sum(games)
 
-    return sum(id for id, game in games if not over_limit(game))
+class Accumulator:
+    # the ids of possible games and the powers of all games, summed as they come
+    def __init__(self):
+        self.part1 = self.part2 = 0
 
-def solve_part2(games):
-    def minimum_needed(game):
-        return reduce(lambda x, y: x.max(y), game)
+    def feed(self, lines):
+        for id, draws in map(parse_game, filter(bytes.strip, lines)):
+            r, g, b = map(max, zip(*draws))
+            if r <= LIMIT[0] and g <= LIMIT[1] and b <= LIMIT[2]:
+                self.part1 += id
+            self.part2 += r * g * b
 
-    return sum(minimum_needed(game).power() for id, game in games)
+    def answers(self):
+        return self.part1, self.part2
 
-def parse_rgb(rgb):
-    cubes = defaultdict(int)
+CUBES = re.compile(rb'(\d+) ([rgb])')
 
-    for count, color in re.findall(r'(\d+) (\w+)', rgb):
+def parse_draw(draw):
+    cubes = { b'r': 0, b'g': 0, b'b': 0 }
+
+    for count, color in CUBES.findall(draw):
         cubes[color] = int(count)
 
-    return RGB(cubes['red'], cubes['green'], cubes['blue'])
+    return cubes[b'r'], cubes[b'g'], cubes[b'b']
 
 def parse_game(game):
-    m = re.match(r'Game (\d+): (.+)', game)
+    head, _, draws = game.partition(b': ')
+
+    id, draws = int(head[5:]), draws.split(b';')
 
-    id, rgbs = int(m[1]), m[2].split(';')
+    return id, list(map(parse_draw, draws))
 
-    return id, list(map(parse_rgb, rgbs))
+def parse(text):
+    games = Games()
+    for game in tokens.lines(text):
+        games.add(*parse_game(game))
+    return games
 
-games = [ parse_game(game) for game in fileinput.input() ]
+if __name__ == '__main__':
+    games = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(games)}')
-print(f'Part 2: {solve_part2(games)}')
+    print(f'Part 1: {solve_part1(games)}')
+    print(f'Part 2: {solve_part2(games)}')
@@ -2,49 +2,103 @@
 
 import fileinput
 import re
+from bisect import bisect_right
 
-adjacent_delta = [
-    (-1, -1), ( 0, -1), ( 1, -1),
-    (-1,  0),           ( 1,  0),
-    (-1,  1), ( 0,  1), ( 1,  1) ]
-
-number_start = dict()
-number_at = dict()
-symbol_at = dict()
-
-def add_coords(a, b):
-    return (a[0] + b[0], a[1] + b[1])
-
-def find_neighbors(coord):
-    adjacent = (add_coords(coord, delta) for delta in adjacent_delta)
-    return set(number_start[adj] for adj in adjacent if adj in number_start)
-
-def coords_to_numbers(coords):
-    return [ number_at[coord] for coord in coords ]
-
-def solve_part1():
-    part_number_coords = set()
-    for coord, symbol in symbol_at.items():
-        part_number_coords.update(find_neighbors(coord))
-    return sum(coords_to_numbers(part_number_coords))
-
-def solve_part2():
-    gears = (coord for coord in symbol_at if symbol_at[coord] == '*')
-    gear_numbers = (coords_to_numbers(find_neighbors(coord)) for coord in gears)
-    return sum(n[0] * n[1] for n in gear_numbers if len(n) == 2)
-
-def index_new_value(y, xrange, value):
-    start = (xrange[0], y)
-    if value.isdecimal():
-        for x in range(xrange[0], xrange[1]):
-            number_start[(x, y)] = start
-        number_at[start] = int(value)
-    else:
-        symbol_at[start] = value
-
-for y, line in enumerate(fileinput.input()):
-    for match in re.finditer(r'\d+|[^.]', line.rstrip()):
-        index_new_value(y, match.span(), match[0])
-
-print(f'Part 1: {solve_part1()}')
-print(f'Part 2: {solve_part2()}')
+import tokens
+
+TOKEN = re.compile(rb'\d+|[^.]')
+
+class Row:
+    # One schematic row: its numbers as sorted, disjoint [start, end) column
+    # spans with their values, and its symbols as (column, symbol) pairs.
+    __slots__ = ('starts', 'ends', 'values', 'symbols')
+
+    def __init__(self, line):
+        self.starts, self.ends, self.values, self.symbols = [ ], [ ], [ ], [ ]
+        for match in TOKEN.finditer(line.rstrip()):
+            token = match[0]
+            if token.isdigit():
+                self.starts.append(match.start())
+                self.ends.append(match.end())
+                self.values.append(int(token))
+            else:
+                self.symbols.append((match.start(), token))
+
+    def touching(self, x):
+        # indices of the numbers with a digit in column x - 1, x or x + 1
+        i = bisect_right(self.starts, x + 1)
+        while i and self.ends[i - 1] >= x:
+            i -= 1
+            yield i
+
+EMPTY = Row(b'')
+
+def settle(rows, counted):
+    # Sums for the symbols of the middle row of three adjacent rows: numbers
+    # beside any symbol count once toward part 1, tracked in one set of
+    # counted number indices per row, and a '*' beside exactly two numbers
+    # is a gear.
+    parts = gears = 0
+    for x, symbol in rows[1].symbols:
+        neighbors = [ ]
+        for row, seen in zip(rows, counted):
+            for i in row.touching(x):
+                neighbors.append(row.values[i])
+                if i not in seen:
+                    seen.add(i)
+                    parts += row.values[i]
+        if symbol == b'*' and len(neighbors) == 2:
+            gears += neighbors[0] * neighbors[1]
+    return parts, gears
+
+class Accumulator:
+    # Only the last two rows are held: the symbols of a row are settled as
+    # soon as the row below it arrives, at which point the row above can no
+    # longer gain a neighbor and is dropped. Memory stays constant however
+    # tall the schematic is.
+    def __init__(self):
+        self.above, self.middle = EMPTY, None
+        self.counted = [ set(), set() ]
+        self.part1 = self.part2 = 0
+
+    def add_rows(self, rows):
+        for row in rows:
+            if self.middle is not None:
+                counted = self.counted + [ set() ]
+                parts, gears = settle((self.above, self.middle, row), counted)
+                self.part1 += parts
+                self.part2 += gears
+                self.above, self.counted = self.middle, counted[1:]
+            self.middle = row
+
+    def feed(self, lines):
+        self.add_rows(map(Row, lines))
+
+    def answers(self):
+        if self.middle is None:
+            return self.part1, self.part2
+        # The last row is settled against an empty row below on copies of
+        # the counted sets, so that rows appended later still count.
+        counted = [ set(seen) for seen in self.counted ] + [ set() ]
+        parts, gears = settle((self.above, self.middle, EMPTY), counted)
+        return self.part1 + parts, self.part2 + gears
+
+def solve(rows):
+    accumulator = Accumulator()
+    accumulator.add_rows(rows)
+    return accumulator.answers()
+
+def solve_part1(rows):
+    return solve(rows)[0]
+
+def solve_part2(rows):
+    return solve(rows)[1]
+
+def parse(text):
+    return [ Row(line) for line in tokens.lines(text) ]
+
+if __name__ == '__main__':
+    rows = parse(''.join(fileinput.input()))
+
+    print(f'Part 1: {solve_part1(rows)}')
+    print(f'Part 2: {solve_part2(rows)}')
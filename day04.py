@@ -1,42 +1,94 @@
 #! /usr/bin/env python3
 
 import fileinput
-import re
-from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+import tokens
+
+class Bits(dict):
+    # number token -> the bit 1 << number, filled in as tokens turn up, so
+    # that masks are built by lookups without converting every token to int
+    def __missing__(self, token):
+        bit = self[token] = 1 << int(token)
+        return bit
+
+BITS = Bits()
+
+def bitmask(numbers):
+    return reduce(or_, map(BITS.__getitem__, numbers.split()), 0)
 
 class Card:
+    __slots__ = ('card_id', 'matches')
+
     def __init__(self, card_id, my_numbers, winning_numbers):
         self.card_id = card_id
-        self.matches = len(set(my_numbers) & set(winning_numbers))
+        self.matches = (my_numbers & winning_numbers).bit_count()
 
     def point_value(self):
         return 0 if self.matches == 0 else 2**(self.matches - 1)
 
-def parse_numbers(numbers):
-    return (int(n) for n in numbers.split())
-
 def parse_card(line):
-    match = re.match(r'Card *(\d+): (.*?) \| (.*)', line)
-    card_id, my_numbers, winning_numbers = match.groups()
-    return Card(int(card_id), parse_numbers(my_numbers), parse_numbers(winning_numbers))
+    card_id, _, numbers = line.partition(b':')
+    my_numbers, _, winning_numbers = numbers.partition(b'|')
+    return Card(int(card_id[4:]), bitmask(my_numbers), bitmask(winning_numbers))
 
 def solve_part1(cards):
     return sum(card.point_value() for card in cards)
 
 def solve_part2(cards):
-    stack_delta = defaultdict(int)
-    this_stack = 1
-    total_cards = 0
+    accumulator = Accumulator()
+    accumulator.add_cards(cards)
+    return accumulator.total_cards
+
+class Accumulator:
+    # Changes in stack size are kept in a ring buffer indexed by card number:
+    # a card's matches reach at most matches + 1 cards ahead, so a ring two
+    # longer than the most matches seen never wraps onto a pending delta. It
+    # grows when a card beats that. Copies won of cards beyond the last one
+    # so far are kept, ready for cards appended later.
+    def __init__(self):
+        self.stack_delta = [ 0 ] * 2
+        self.count = 0
+        self.this_stack = 1
+        self.points = self.total_cards = 0
+
+    def grow(self, size):
+        ring, count = self.stack_delta, self.count
+        grown = [ 0 ] * size
+        for i in range(count, count + len(ring)):
+            grown[i % size] = ring[i % len(ring)]
+        self.stack_delta = grown
+
+    def add_cards(self, cards):
+        stack_delta, this_stack = self.stack_delta, self.this_stack
+        size = len(stack_delta)
+        for i, card in enumerate(cards, self.count):
+            if card.matches + 2 > size:
+                self.count, self.this_stack = i, this_stack
+                self.grow(card.matches + 2)
+                stack_delta, size = self.stack_delta, len(self.stack_delta)
+            self.points += card.point_value()
+            slot = i % size
+            this_stack += stack_delta[slot]
+            stack_delta[slot] = 0
+            self.total_cards += this_stack
+            stack_delta[(i + 1) % size] += this_stack
+            stack_delta[(i + 1 + card.matches) % size] -= this_stack
+            self.count = i + 1
+        self.this_stack = this_stack
+
+    def feed(self, lines):
+        self.add_cards(map(parse_card, filter(bytes.strip, lines)))
 
-    for i, card in enumerate(cards):
-        this_stack += stack_delta[i]
-        total_cards += this_stack
-        stack_delta[i + 1] += this_stack
-        stack_delta[i + 1 + card.matches] -= this_stack
+    def answers(self):
+        return self.points, self.total_cards
 
-    return total_cards
+def parse(text):
+    return [ parse_card(line) for line in tokens.lines(text) ]
 
-cards = [ parse_card(line) for line in fileinput.input() ]
+if __name__ == '__main__':
+    cards = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(cards)}')
-print(f'Part 2: {solve_part2(cards)}')
+    print(f'Part 1: {solve_part1(cards)}')
+    print(f'Part 2: {solve_part2(cards)}')
@@ -1,84 +1,185 @@
 #! /usr/bin/env python3
 
 import fileinput
+from bisect import bisect_left, bisect_right
 from functools import reduce
-from more_itertools import chunked
-
-INFINITY = 9e99
-
-class Interval:
-    def __init__(self, lo, hi):
-        self.lo, self.hi = lo, hi
-
-    def __lt__(self, other):
-        return self.hi < other.hi
-
-    def empty(self):
-        return self.lo == self.hi
-
-    def contains(self, value):
-        return self.lo <= value < self.hi
-
-    def translate(self, delta):
-        return Interval(self.lo + delta, self.hi + delta)
-
-    def cut(self, value):
-        left  = Interval(min(self.lo, value), min(self.hi, value))
-        right = Interval(max(self.lo, value), max(self.hi, value))
-        return left, right
+from itertools import compress
+from math import inf
+from operator import ne
+
+import backend
+import tokens
+from intervals import IntervalSet
+
+# segments per precomputed minimum in Piecewise.heads()
+BLOCK = 64
+
+class Piecewise:
+    # The map x -> x + deltas[bisect_right(bounds, x)]: sorted breakpoints
+    # split the number line into segments that are each shifted by their own
+    # delta, the first and last segments reaching to -inf and inf.
+    __slots__ = ('bounds', 'deltas', 'table', 'vectors')
+
+    def __init__(self, bounds=(), deltas=(0,)):
+        # adjacent segments with the same delta are merged
+        changed = list(map(ne, deltas[1:], deltas))
+        self.bounds = list(compress(bounds, changed))
+        self.deltas = [ deltas[0] ] + list(compress(deltas[1:], changed))
+        self.table = self.vectors = None
+
+    @classmethod
+    def from_pieces(cls, pieces):
+        # sorted, disjoint (lo, hi, delta) pieces; values outside every piece
+        # map to themselves
+        bounds, deltas = [ ], [ 0 ]
+        for lo, hi, delta in pieces:
+            if bounds and bounds[-1] == lo:
+                deltas[-1] = delta
+            else:
+                bounds.append(lo)
+                deltas.append(delta)
+            bounds.append(hi)
+            deltas.append(0)
+        return cls(bounds, deltas)
+
+    def __call__(self, value):
+        return value + self.deltas[bisect_right(self.bounds, value)]
+
+    def then(self, after):
+        # the composition that applies self, then after
+        bounds, deltas = [ ], [ ]
+        after_bounds, after_deltas = after.bounds, after.deltas
+        lo = -inf
+        for hi, delta in zip(self.bounds + [ inf ], self.deltas):
+            # the image [lo + delta, hi + delta) cut at after's breakpoints
+            i = bisect_right(after_bounds, lo + delta)
+            j = bisect_left(after_bounds, hi + delta, i)
+            bounds.append(lo)
+            deltas.append(delta + after_deltas[i])
+            if i < j:
+                bounds += [ bound - delta for bound in after_bounds[i:j] ]
+                deltas += [ delta + after_delta for after_delta in after_deltas[i + 1:j + 1] ]
+            lo = hi
+        # bounds[0] is -inf, the start of the first segment
+        return Piecewise(bounds[1:], deltas)
+
+    def heads(self):
+        # The value at the start of each bounded segment, and the least of
+        # each block of BLOCK of them, so that the least over any run of
+        # segments takes a few min() calls over slices.
+        if self.table is None:
+            heads = [ bound + delta for bound, delta in zip(self.bounds, self.deltas[1:]) ]
+            blocks = [ min(heads[k:k + BLOCK]) for k in range(0, len(heads), BLOCK) ]
+            self.table = heads, blocks
+        return self.table
+
+    def least_head(self, i, j):
+        # the least of heads[i:j], for i < j
+        heads, blocks = self.heads()
+        first, last = -(-i // BLOCK), j // BLOCK
+        if first >= last:
+            return min(heads[i:j])
+        return min(heads[i:first * BLOCK] + blocks[first:last] + heads[last * BLOCK:j])
+
+    def arrays(self):
+        # bounds and deltas as int64 arrays, kept for later batch lookups
+        import numpy as np
+
+        if self.vectors is None:
+            self.vectors = np.array(self.bounds, dtype=np.int64), np.array(self.deltas, dtype=np.int64)
+        return self.vectors
+
+    def min_value(self, ranges):
+        # Each segment is increasing, so the minimum over [lo, hi) is either
+        # lo itself, mapped, or the start of a later segment within the range.
+        bounds, deltas = self.bounds, self.deltas
+        least = inf
+        for lo, hi in ranges:
+            if lo >= hi:
+                continue
+            i = bisect_right(bounds, lo)
+            least = min(least, lo + deltas[i])
+            j = bisect_left(bounds, hi, i)
+            if i < j:
+                least = min(least, self.least_head(i, j))
+        return least
 
 class Mapping:
     def __init__(self, ranges):
-        maps = ((Interval(src, src + length), dest - src) for dest, src, length in ranges)
-        self.maps = self.fill_in_gaps(maps)
-
-    def fill_in_gaps(self, maps):
-        result = [ ]
-        prev_hi = -INFINITY
-        for src, delta in sorted(maps):
-            left, right = Interval(prev_hi, src.hi).cut(src.lo)
-            result.extend([ (left, 0), (right, delta) ])
-            prev_hi = src.hi
-        result.append((Interval(prev_hi, INFINITY), 0))
-        return result
-
-    def find_mapping(self, value):
-        return next((src, delta) for src, delta in self.maps if src.contains(value))
-
-    def map_interval(self, interval):
-        result = [ ]
-        while not interval.empty():
-            src, delta = self.find_mapping(interval.lo)
-            prefix, interval = interval.cut(src.hi)
-            result.append(prefix.translate(delta))
-        return result
-
-    def map_intervals(self, intervals):
-        return reduce(lambda acc, val: acc + self.map_interval(val), intervals, [])
-
-def parse_seeds(text):
-    return list(map(int, text.split()[1:]))
-
-def parse_mapping(text):
-    return Mapping(map(int, line.split()) for line in text.split('\n')[1:])
-
-def map_intervals(mappings, intervals):
-    return reduce(lambda acc, val: val.map_intervals(acc), mappings, intervals)
-
-def min_mapped_value(mappings, intervals):
-    return min(interval.lo for interval in map_intervals(mappings, intervals))
-
-def solve_part1(mappings, seeds):
-    intervals = (Interval(seed, seed + 1) for seed in seeds)
-    return min_mapped_value(mappings, intervals)
-
-def solve_part2(mappings, seeds):
-    intervals = (Interval(lo, lo + length) for lo, length in chunked(seeds, 2))
-    return min_mapped_value(mappings, intervals)
-
-input_sections = ''.join(fileinput.input()).rstrip().split('\n\n')
-seeds = parse_seeds(input_sections[0])
-mappings = list(map(parse_mapping, input_sections[1:]))
-
-print(f'Part 1: {solve_part1(mappings, seeds)}')
-print(f'Part 2: {solve_part2(mappings, seeds)}')
+        self.pieces = sorted((src, src + length, dest - src) for dest, src, length in ranges)
+        self.function = Piecewise.from_pieces(self.pieces)
+
+def parse_seeds(section):
+    return tokens.integers(section)
+
+def parse_mapping(section):
+    _, _, ranges = section.partition(b'\n')
+    return Mapping(tokens.rows(ranges, 3))
+
+def compose(mappings):
+    # The whole chain of mappings as one piecewise map. Folding from the
+    # last mapping keeps the left operand of then(), whose segments are
+    # walked one by one, a single stage; the growing composite is only cut
+    # by slicing.
+    functions = [ mapping.function for mapping in mappings ]
+    return reduce(lambda after, function: function.then(after), reversed(functions), Piecewise())
+
+def map_seeds(functions, seeds):
+    # Pushes a NumPy array of seeds through piecewise maps, e.g. one per
+    # mapping stage or a composed one: each takes one searchsorted over its
+    # breakpoints and a gather of the deltas. Returns the mapped array and
+    # its minimum.
+    import numpy as np
+
+    for function in functions:
+        bounds, deltas = function.arrays()
+        seeds = seeds + deltas[np.searchsorted(bounds, seeds, side='right')]
+    return seeds, seeds.min()
+
+@backend.dispatch(threshold=200, cold_threshold=100000, size=lambda location, seeds: len(seeds))
+def lowest_location(location, seeds):
+    return min(map(location, seeds))
+
+@lowest_location.numpy
+def lowest_location_numpy(location, seeds):
+    import numpy as np
+
+    try:
+        values = np.array(seeds, dtype=np.int64)
+        arrays = (values, *location.arrays())
+    except OverflowError:
+        arrays = None
+    # seed + delta must stay well inside int64
+    if arrays is None or not all(-2**62 < int(array.min(initial=0)) and int(array.max(initial=0)) < 2**62
+                                 for array in arrays):
+        return lowest_location.python(location, seeds)
+    _, lowest = map_seeds([ location ], values)
+    return int(lowest)
+
+def solve_part1(almanac):
+    location, seeds = almanac
+    return lowest_location(location, seeds)
+
+def solve_part2(almanac):
+    location, seeds = almanac
+    # overlapping seed ranges are merged first, so no segment is scanned twice
+    seed_ranges = IntervalSet((lo, lo + length) for lo, length in zip(seeds[::2], seeds[1::2]))
+    return location.min_value(seed_ranges.ranges())
+
+def solve_sections(sections):
+    almanac = parse_sections(sections)
+    return solve_part1(almanac), solve_part2(almanac)
+
+def parse_sections(sections):
+    sections = iter(sections)
+    seeds = parse_seeds(next(sections))
+    return compose(map(parse_mapping, sections)), seeds
+
+def parse(text):
+    return parse_sections(tokens.sections(text))
+
+if __name__ == '__main__':
+    almanac = parse(''.join(fileinput.input()))
+
+    print(f'Part 1: {solve_part1(almanac)}')
+    print(f'Part 2: {solve_part2(almanac)}')
@@ -1,33 +1,66 @@
 #! /usr/bin/env python3
 
 import fileinput
-from math import sqrt, ceil, floor
-from functools import reduce
+from math import isqrt, prod
+
+import backend
+import tokens
 
 def ways_to_win(time, distance):
-    midpoint = time / 2
-    spread = sqrt(midpoint**2 - distance)
-    lo, hi = ceil(midpoint - spread), floor(midpoint + spread)
-    if lo * (time - lo) == distance: lo += 1
-    if hi * (time - hi) == distance: hi -= 1
-    return hi - lo + 1
+    # Holding for h wins when h * (time - h) > distance, that is when
+    # (time - 2h)**2 < time**2 - 4 * distance. The k = time - 2h that
+    # qualify are those with |k| <= r and the parity of time, where r is the
+    # integer square root of one less than that bound, all in exact integers.
+    bound = time * time - 4 * distance
+    if bound <= 0:
+        return 0
+    r = isqrt(bound - 1)
+    return r + 1 - ((time - r) & 1)
+
+@backend.dispatch(threshold=300, cold_threshold=10**6, size=lambda times, distances: len(times))
+def all_ways_to_win(times, distances):
+    return list(map(ways_to_win, times, distances))
+
+@all_ways_to_win.numpy
+def all_ways_to_win_numpy(times, distances):
+    import numpy as np
+
+    try:
+        time = np.asarray(times, dtype=np.int64)
+        distance = np.asarray(distances, dtype=np.int64)
+        # time**2 and 4 * distance stay inside int64
+        fits = all(-limit < int(array.min(initial=0)) and int(array.max(initial=0)) < limit
+                   for array, limit in ((time, 2**31), (distance, 2**60)))
+    except OverflowError:
+        fits = False
+    if not fits:
+        return all_ways_to_win.python(times, distances)
 
-def product(numbers):
-    return reduce(lambda acc, val: acc * val, numbers, 1)
+    below = time * time - 4 * distance - 1
+    # A float64 square root is within one of the exact root below 2**62,
+    # so one step either way makes it exact.
+    r = np.sqrt(np.maximum(below, 0).astype(np.float64)).astype(np.int64)
+    r -= r * r > below
+    r += (r + 1) * (r + 1) <= below
+    return np.where(below >= 0, r + 1 - ((time - r) & 1), 0).tolist()
 
 def join_numbers(numbers):
     return int(''.join(map(str, numbers)))
 
-def solve_part1(times, distances):
-    return product(ways_to_win(time, distance) for time, distance in zip(times, distances))
+def solve_part1(races):
+    times, distances = races
+    return prod(all_ways_to_win(times, distances))
 
-def solve_part2(times, distances):
+def solve_part2(races):
+    times, distances = races
     return ways_to_win(join_numbers(times), join_numbers(distances))
 
-def parse_numbers(line):
-    return list(map(int, line.split()[1:]))
+def parse(text):
+    times, distances = tokens.integer_lines(text)
+    return times, distances
 
-times, distances = list(map(parse_numbers, fileinput.input()))
+if __name__ == '__main__':
+    races = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(times, distances)}')
-print(f'Part 2: {solve_part2(times, distances)}')
+    print(f'Part 1: {solve_part1(races)}')
+    print(f'Part 2: {solve_part2(races)}')
@@ -1,45 +1,222 @@
 #! /usr/bin/env python3
 
 import fileinput
-from collections import Counter
+import functools
+import heapq
+import os
+import tempfile
+from array import array
+from operator import itemgetter
 
-class Hand:
-    def __init__(self, cards):
-        self.ranks = [ Hand.rank_of(card) for card in cards ]
-        self.strength = Hand.get_strength(self.ranks)
+import backend
+import tokens
 
-    def __lt__(self, other):
-        return (self.strength, self.ranks) < (other.strength, other.ranks)
+# Card ranks as base-13 digits, so that int(cards.translate(...), 13) packs
+# the five ranks into one integer ordered like the hands.
+RANKS = bytes.maketrans(b'23456789TJQKA', b'0123456789abc')
+JOKER_RANKS = bytes.maketrans(b'J23456789TQKA', b'0123456789abc')
 
-    def rank_of(card):
-        return '23456789TJQKA'.index(card)
+HAND_SIZE = 5
 
-    def get_strength(ranks):
-        return sorted(Counter(ranks).values(), reverse=True)
+# hand_type() of each type from high card up, and the range of packed keys
+TYPES = [ 5, 7, 9, 11, 13, 17, 25 ]
+KEY_SPACE = len(TYPES) * 13**HAND_SIZE
 
-class JokerHand(Hand):
-    def __init__(self, hand):
-        joker_rank = Hand.rank_of('J')
-        self.ranks = [ -1 if rank == joker_rank else rank for rank in hand.ranks ]
-        self.strength = JokerHand.upgrade_strength(hand.strength, hand.ranks.count(joker_rank))
+# Set from $AOC_RUN_LENGTH or runner.py --run-length. Once nonzero,
+# solve_stream sorts externally, spilling sorted runs of this many hands to
+# disk, instead of grouping equal hands in memory.
+run_length = int(os.environ.get('AOC_RUN_LENGTH', 0))
 
-    def upgrade_strength(strength, joker_count):
-        if 1 <= joker_count <= 4:
-            strength = strength.copy()
-            strength.remove(joker_count)
-            strength[0] += joker_count
-        return strength
+def hand_type(cards):
+    # The sum of the squared counts of each card: 5 for high card, then 7, 9,
+    # 11, 13, 17 and 25 for five of a kind, so it orders the hand types.
+    return sum(map(cards.count, cards))
 
-def total_winnings(hands):
-    return sum(rank * bid for rank, (hand, bid) in enumerate(sorted(hands), start=1))
+def joker_type(cards):
+    # jokers join whichever card there is most of
+    others = cards.replace(b'J', b'')
+    most = max(map(others.count, others), default=0)
+    jokers = HAND_SIZE - len(others)
+    return hand_type(others) - most * most + (most + jokers) ** 2
+
+@functools.cache
+def hand_types(cards):
+    # types depend only on which cards are held, of which there are just 6188
+    # sorted hands, so they are worked out once per sorted hand
+    return (TYPES.index(hand_type(cards)) * 13**HAND_SIZE,
+            TYPES.index(joker_type(cards)) * 13**HAND_SIZE)
+
+def hand_keys(cards):
+    # one packed sort key per ruleset: the type above the card ranks
+    kind, joker_kind = hand_types(bytes(sorted(cards)))
+    return kind + int(cards.translate(RANKS), 13), joker_kind + int(cards.translate(JOKER_RANKS), 13)
+
+class Hands:
+    # Columns of packed keys for both rulesets and of bids, as int64 arrays
+    # that NumPy can view without copying.
+    def __init__(self):
+        self.keys, self.joker_keys, self.bids = array('q'), array('q'), array('q')
+
+    def __len__(self):
+        return len(self.bids)
+
+    def add(self, cards, bid):
+        key, joker_key = hand_keys(cards)
+        self.keys.append(key)
+        self.joker_keys.append(joker_key)
+        self.bids.append(bid)
+
+@backend.dispatch(threshold=200, cold_threshold=250000, size=lambda keys, bids: len(keys))
+def total_winnings(keys, bids):
+    # equal hands rank in the order they were dealt, so the sort is stable
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return sum(rank * bids[i] for rank, i in enumerate(order, start=1))
+
+@total_winnings.numpy
+def total_winnings_numpy(keys, bids):
+    import numpy as np
+
+    order = np.argsort(np.asarray(keys, dtype=np.int64), kind='stable')
+    ranked = np.asarray(bids, dtype=np.int64)[order].tolist()
+    # weighted in Python, so large inputs cannot overflow
+    return sum(rank * bid for rank, bid in enumerate(ranked, start=1))
 
 def solve_part1(hands):
-    return total_winnings(hands)
+    return total_winnings(hands.keys, hands.bids)
 
 def solve_part2(hands):
-    return total_winnings((JokerHand(hand), bid) for hand, bid in hands)
+    return total_winnings(hands.joker_keys, hands.bids)
+
+def grouped_winnings(groups):
+    total, rank = 0, 1
+    for key, (count, bids, weighted) in sorted(groups, key=itemgetter(0)):
+        total += rank * bids + weighted
+        rank += count
+    return total
+
+def solve_stream(lines):
+    if run_length:
+        return external_winnings(lines, run_length)
+    # Only distinct hands need to be kept, and there are at most 13**5 of them.
+    # For each one, keep its count, its bid total, and each bid weighted by how
+    # many equal hands came before it. That last sum is what ranking equal
+    # hands in arrival order (the stable sort) adds on top of their base rank.
+    groups = { }
+    for line in filter(bytes.strip, lines):
+        cards, bid = line.split()
+        group = groups.setdefault(cards, [ 0, 0, 0 ])
+        group[2] += group[0] * int(bid)
+        group[0] += 1
+        group[1] += int(bid)
+    keys = [ (hand_keys(cards), group) for cards, group in groups.items() ]
+    return (grouped_winnings((key, group) for (key, _), group in keys),
+            grouped_winnings((joker_key, group) for (_, joker_key), group in keys))
+
+class Ranking:
+    # Total winnings of one ruleset, kept up to date as hands are dealt. A
+    # Fenwick tree over the packed keys holds the count and bid total of the
+    # hands at or below each key. A new hand ranks just above all hands with
+    # keys up to its own, and every stronger hand moves up one rank, which
+    # adds their bid total once. The tree is sparse, a dict of the nodes
+    # touched so far, so memory follows the hands dealt, not the key space.
+    def __init__(self):
+        self.tree = { }
+        self.count = self.bids = self.total = 0
+
+    def weaker(self, key):
+        # count and bid total of the hands with keys up to key
+        count = bids = 0
+        i = key + 1
+        while i:
+            node = self.tree.get(i)
+            if node:
+                count += node[0]
+                bids += node[1]
+            i &= i - 1
+        return count, bids
+
+    def add(self, key, bid):
+        count, bids = self.weaker(key)
+        self.total += (count + 1) * bid + self.bids - bids
+        self.count += 1
+        self.bids += bid
+        i = key + 1
+        while i <= KEY_SPACE:
+            node = self.tree.setdefault(i, [ 0, 0 ])
+            node[0] += 1
+            node[1] += bid
+            i += i & -i
+        return self.total
+
+class Accumulator:
+    # running totals for both rulesets that more hands can be dealt into
+    def __init__(self):
+        self.rankings = Ranking(), Ranking()
+
+    def deal(self, cards, bid):
+        return tuple(ranking.add(key, bid) for ranking, key in zip(self.rankings, hand_keys(cards)))
+
+    def feed(self, lines):
+        for line in filter(bytes.strip, lines):
+            cards, bid = line.split()
+            self.deal(cards, int(bid))
+
+    def answers(self):
+        return tuple(ranking.total for ranking in self.rankings)
+
+def spill(directory, name, pairs):
+    # a run of (key, bid) pairs, stably sorted by key, written as int64s
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        array('q', [ value for pair in sorted(pairs, key=itemgetter(0)) for value in pair ]).tofile(f)
+    return path
+
+def read_run(path, chunk=1 << 16):
+    with open(path, 'rb') as f:
+        while True:
+            values = array('q')
+            try:
+                values.fromfile(f, 2 * chunk)
+            except EOFError:
+                pass
+            if not values:
+                return
+            yield from zip(values[::2], values[1::2])
+
+def merged_winnings(paths):
+    merged = heapq.merge(*map(read_run, paths), key=itemgetter(0))
+    return sum(rank * bid for rank, (_, bid) in enumerate(merged, start=1))
+
+def external_winnings(lines, run_length):
+    # Both answers for inputs larger than memory: hands are keyed as they
+    # are read, spilled to disk in sorted runs of run_length, and ranked in
+    # one streaming merge of the runs per ruleset. heapq.merge prefers the
+    # earlier run on equal keys, which keeps equal hands in dealt order.
+    with tempfile.TemporaryDirectory(prefix='day07-') as directory:
+        runs, joker_runs = [ ], [ ]
+        pairs, joker_pairs = [ ], [ ]
+        for line in filter(bytes.strip, lines):
+            cards, bid = line.split()
+            key, joker_key = hand_keys(cards)
+            pairs.append((key, int(bid)))
+            joker_pairs.append((joker_key, int(bid)))
+            if len(pairs) == run_length:
+                runs.append(spill(directory, f'run{len(runs)}', pairs))
+                joker_runs.append(spill(directory, f'joker{len(joker_runs)}', joker_pairs))
+                pairs, joker_pairs = [ ], [ ]
+        if pairs:
+            runs.append(spill(directory, f'run{len(runs)}', pairs))
+            joker_runs.append(spill(directory, f'joker{len(joker_runs)}', joker_pairs))
+        return merged_winnings(runs), merged_winnings(joker_runs)
+
+def parse(text):
+    hands = Hands()
+    for cards, bid in map(bytes.split, tokens.lines(text)):
+        hands.add(cards, int(bid))
+    return hands
 
-hands = [ (Hand(cards), int(bid)) for cards, bid in map(str.split, fileinput.input()) ]
+if __name__ == '__main__':
+    hands = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(hands)}')
-print(f'Part 2: {solve_part2(hands)}')
+    print(f'Part 1: {solve_part1(hands)}')
+    print(f'Part 2: {solve_part2(hands)}')
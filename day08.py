@@ -3,45 +3,134 @@
 import fileinput
 import re
 import math
+from itertools import compress
+from operator import or_
+
+import backend
+import tokens
+
+NODE = re.compile(rb'(\w+) = \((\w+), (\w+)\)')
+
+@backend.dispatch(threshold=5000, cold_threshold=500000, size=lambda steps, moves, ends: len(ends) * len(moves))
+def cycle_tables(steps, moves, ends):
+    # For every node, where one pass over the moves leads, and the first move
+    # of that pass (from 1) that lands on an end node, or 0 if none does.
+    nodes = range(len(ends))
+    node, first = list(nodes), [ 0 ] * len(ends)
+    for k, move in enumerate(moves, 1):
+        node = list(map(steps[move].__getitem__, node))
+        for i in compress(nodes, map(ends.__getitem__, node)):
+            if not first[i]:
+                first[i] = k
+    return node, first
+
+@cycle_tables.numpy
+def cycle_tables_numpy(steps, moves, ends):
+    import numpy as np
+
+    steps = [ np.array(step) for step in steps ]
+    ends = np.array(ends, dtype=bool)
+    node, first = np.arange(len(ends)), np.zeros(len(ends), dtype=np.int64)
+    for k, move in enumerate(moves, 1):
+        node = steps[move][node]
+        first[(first == 0) & ends[node]] = k
+    return node.tolist(), first.tolist()
 
 class Network:
+    # Nodes are interned to integer ids, with their left and right
+    # successors in flat lists. Once compiled, cycle[i] is where one pass over
+    # all the moves leads from i, and jumps[k] and hits[k] are where 2**k
+    # passes lead and whether they land on a node ending in Z on the way.
     def __init__(self, moves):
         self.moves = moves
-        self.succ = { }
+        self.ids, self.names = { }, [ ]
+        self.left, self.right = [ ], [ ]
+        self.first = self.jumps = self.hits = None
+
+    def intern(self, name):
+        id = self.ids.get(name)
+        if id is None:
+            id = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.left.append(id)
+            self.right.append(id)
+        return id
 
     def add_node(self, node, left, right):
-        self.succ[node] = (left, right)
+        node = self.intern(node)
+        self.left[node], self.right[node] = self.intern(left), self.intern(right)
 
     def a_nodes(self):
-        return (node for node in self.succ if node[-1] == 'A')
+        return (node for node in self.names if node.endswith(b'A'))
 
-    def first_z(self, node):
-        return next(steps for (steps, node) in enumerate(self.successors(node), 1) if node[-1] == 'Z')
+    def compile(self):
+        ends = [ name.endswith(b'Z') for name in self.names ]
+        cycle, self.first = cycle_tables((self.left, self.right), self.moves, ends)
+        self.jumps, self.hits = [ cycle ], [ list(map(bool, self.first)) ]
+
+    def level(self, k):
+        # the tables for 2**k passes, doubling up from the last one built
+        if self.jumps is None:
+            self.compile()
+        jumps, hits = self.jumps, self.hits
+        while len(jumps) <= k:
+            jump, hit = jumps[-1], hits[-1]
+            hits.append(list(map(or_, hit, map(hit.__getitem__, jump))))
+            jumps.append(list(map(jump.__getitem__, jump)))
+        return jumps[k], hits[k]
 
-    def successors(self, node):
-        while True:
-            for move in self.moves:
-                node = self.succ[node][move]
-                yield node
+    def first_z(self, node):
+        # Find the fewest doublings of passes that reach a node ending in Z,
+        # then skip passes in halving strides while they miss every such
+        # node. There are only so many nodes to start a pass from, so one is
+        # reached within that many passes if at all.
+        start, node, passes = node, self.ids[node], 0
+        top = 0
+        while not self.level(top)[1][node] and 1 << top <= len(self.names):
+            top += 1
+        for k in reversed(range(top)):
+            jump, hit = self.level(k)
+            if not hit[node]:
+                node, passes = jump[node], passes + (1 << k)
+        if not self.first[node]:
+            raise ValueError(f'no node ending in Z is reachable from {start.decode()}')
+        return passes * len(self.moves) + self.first[node]
 
-def ends_with(char):
-    return lambda node: node[-1] == char
+    def after(self, node, steps):
+        # the node reached in the given number of steps, whole passes taken
+        # through the jump tables and the rest one move at a time
+        passes, rest = divmod(steps, len(self.moves))
+        node = self.ids[node]
+        for k in range(passes.bit_length()):
+            if passes >> k & 1:
+                node = self.level(k)[0][node]
+        for move in self.moves[:rest]:
+            node = (self.left, self.right)[move][node]
+        return self.names[node]
 
 def solve_part1(network):
-    return network.first_z('AAA')
+    return network.first_z(b'AAA')
 
 def solve_part2(network):
     # the input was special: this is not a general solution
     return math.lcm(*(network.first_z(node) for node in network.a_nodes()))
 
-def parse_network(text):
-    moves, nodes = text.split('\n\n')
-    network = Network([ 'LR'.index(move) for move in moves ])
-    for node in nodes.rstrip().split('\n'):
-        network.add_node(*re.findall(r'\w+', node))
+def solve_sections(sections):
+    network = parse_sections(sections)
+    return solve_part1(network), solve_part2(network)
+
+def parse_sections(sections):
+    moves, nodes = sections
+    network = Network([ b'LR'.index(move) for move in moves.strip() ])
+    for node in NODE.findall(nodes):
+        network.add_node(*node)
     return network
 
-network = parse_network(''.join(fileinput.input()))
+def parse(text):
+    return parse_sections(tokens.sections(text))
+
+if __name__ == '__main__':
+    network = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(network)}')
-print(f'Part 2: {solve_part2(network)}')
+    print(f'Part 1: {solve_part1(network)}')
+    print(f'Part 2: {solve_part2(network)}')
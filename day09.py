@@ -1,6 +1,10 @@
 #! /usr/bin/env python3
 
 import fileinput
+from math import comb
+
+import backend
+import tokens
 
 def forward_difference(history):
     return [ b - a for a, b in zip(history, history[1:]) ]
@@ -10,16 +14,75 @@ def extrapolate(history):
         return history[-1] + extrapolate(forward_difference(history))
     return 0
 
-def solve_part1(histories):
+def history_values(histories, backwards=False):
+    return sum(map(len, histories))
+
+@backend.dispatch(threshold=100, cold_threshold=300000, size=history_values)
+def sum_extrapolated(histories, backwards=False):
+    if backwards:
+        histories = (history[::-1] for history in histories)
     return sum(map(extrapolate, histories))
 
+def extrapolation_weights(length):
+    # The differences bottom out after at most `length` rows, so the next
+    # value is a fixed signed-binomial combination of the history.
+    return [ (-1)**(length - 1 - i) * comb(length, i) for i in range(length) ]
+
+@sum_extrapolated.numpy
+def sum_extrapolated_numpy(histories, backwards=False):
+    import numpy as np
+
+    by_length = { }
+    for history in histories:
+        by_length.setdefault(len(history), []).append(history)
+
+    total = 0
+    for length, group in by_length.items():
+        if length == 0:
+            continue
+        weights = extrapolation_weights(length)
+        if backwards:
+            weights.reverse()
+        try:
+            # long histories have binomial weights beyond int64 even when
+            # every value is zero
+            values, vector = np.array(group, dtype=np.int64), np.array(weights, dtype=np.int64)
+            bound = int(np.abs(values).max()) * sum(map(abs, weights))
+        except OverflowError:
+            bound = 2**63
+        if bound < 2**63:
+            # each row fits in int64; their sum is taken exactly in Python
+            total += sum((values @ vector).tolist())
+        else:
+            # a weighted sum could pass int64
+            total += sum_extrapolated.python(group, backwards)
+    return total
+
+def solve_part1(histories):
+    return sum_extrapolated(histories)
+
 def solve_part2(histories):
-    return solve_part1(history[::-1] for history in histories)
+    return sum_extrapolated(histories, backwards=True)
+
+class Accumulator:
+    # sums of each history's next and previous values, one history per line
+    def __init__(self):
+        self.part1 = self.part2 = 0
+
+    def feed(self, lines):
+        for history in map(tokens.integers, lines):
+            if history:
+                self.part1 += extrapolate(history)
+                self.part2 += extrapolate(history[::-1])
+
+    def answers(self):
+        return self.part1, self.part2
 
-def parse_numbers(line):
-    return [ int(n) for n in line.split() ]
+def parse(text):
+    return tokens.integer_lines(text)
 
-histories = [ parse_numbers(line) for line in fileinput.input() ]
+if __name__ == '__main__':
+    histories = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(histories)}')
-print(f'Part 2: {solve_part2(histories)}')
+    print(f'Part 1: {solve_part1(histories)}')
+    print(f'Part 2: {solve_part2(histories)}')
@@ -2,6 +2,9 @@
 
 import fileinput
 from collections import defaultdict
+from itertools import chain
+
+import backend
 
 def preprocess(counts):
     delta_prefix = [ ]
@@ -13,6 +16,7 @@ def preprocess(counts):
     delta_prefix.append((0, total))
     return delta_prefix
 
+@backend.dispatch(threshold=1000, cold_threshold=10**6, size=lambda axis, expansion: len(axis))
 def total_distance(axis, expansion):
     _, num_galaxies = axis[-1]
     total = 0
@@ -21,13 +25,25 @@ def total_distance(axis, expansion):
         total += ((dx - 1) * expansion + 1) * prefix * suffix
     return total
 
+@total_distance.numpy
+def total_distance_numpy(axis, expansion):
+    import numpy as np
+
+    dx, prefix = np.fromiter(chain.from_iterable(axis), dtype=np.int64, count=2 * len(axis)).reshape(-1, 2).T
+    pairs = prefix * (prefix[-1] - prefix)
+    # the expansion factor is applied outside NumPy so large factors stay exact
+    gaps = int(((dx - 1) * pairs).sum())
+    return gaps * expansion + int(pairs.sum())
+
 def solve_generic(rows, cols, expansion):
     return sum(total_distance(axis, expansion) for axis in (rows, cols))
 
-def solve_part1(rows, cols):
+def solve_part1(galaxies):
+    rows, cols = galaxies
     return solve_generic(rows, cols, 2)
 
-def solve_part2(rows, cols):
+def solve_part2(galaxies):
+    rows, cols = galaxies
     return solve_generic(rows, cols, 1000000)
 
 def parse_galaxies(file):
@@ -39,7 +55,11 @@ def parse_galaxies(file):
                 cols[c] += 1
     return preprocess(rows), preprocess(cols)
 
-rows, cols = parse_galaxies(fileinput.input())
+def parse(text):
+    return parse_galaxies(text.splitlines())
+
+if __name__ == '__main__':
+    galaxies = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(rows, cols)}')
-print(f'Part 2: {solve_part2(rows, cols)}')
+    print(f'Part 1: {solve_part1(galaxies)}')
+    print(f'Part 2: {solve_part2(galaxies)}')
@@ -2,6 +2,8 @@
 
 import fileinput
 from functools import lru_cache
+import parallel
+from instrument import counters
 
 def count_matches(springs, groups):
     @lru_cache
@@ -19,13 +21,32 @@ def count_matches(springs, groups):
             count += count_matches(springs[length + 1:], groups[1:])
         return count
 
-    return count_matches(springs + '.', groups + (0,))
+    count = count_matches(springs + '.', groups + (0,))
+    if counters.enabled:
+        info = count_matches.cache_info()
+        counters.add('memo hits', info.hits)
+        counters.add('memo misses', info.misses)
+    return count
+
+def record_matches(records, n):
+    springs, groups = records[n]
+    return count_matches(springs, groups)
 
 def solve_part1(records):
-    return sum(count_matches(springs, groups) for springs, groups in records)
+    return parallel.map_reduce(record_matches, records, len(records))
 
 def solve_part2(records):
-    return solve_part1(('?'.join([springs] * 5), groups * 5) for springs, groups in records)
+    return solve_part1([ ('?'.join([springs] * 5), groups * 5) for springs, groups in records ])
+
+def solve_stream(lines):
+    part1 = part2 = 0
+    for line in lines:
+        line = line.decode().rstrip()
+        if line:
+            springs, groups = parse_record(line)
+            part1 += count_matches(springs, groups)
+            part2 += count_matches('?'.join([springs] * 5), groups * 5)
+    return part1, part2
 
 def parse_numbers(numbers):
     return tuple(int(number) for number in numbers.split(','))
@@ -34,7 +55,11 @@ def parse_record(line):
     springs, groups = line.split(' ')
     return springs, parse_numbers(groups)
 
-records = [ parse_record(line.rstrip()) for line in fileinput.input() ]
+def parse(text):
+    return [ parse_record(line.rstrip()) for line in text.splitlines() ]
+
+if __name__ == '__main__':
+    records = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(records)}')
-print(f'Part 2: {solve_part2(records)}')
+    print(f'Part 1: {solve_part1(records)}')
+    print(f'Part 2: {solve_part2(records)}')
@@ -1,36 +1,41 @@
 #! /usr/bin/env python3
 
 import fileinput
+import parallel
+import tokens
+from flatgrid import FlatGrid
 
-class Grid:
-    def __init__(self, text):
-        self.grid = text.split('\n')
-        self.rows, self.cols = len(self.grid), len(self.grid[0])
+MASK_DIGITS = bytes.maketrans(b'#.', b'10')
 
-    def get(self, row, col):
-        return self.grid[row][col]
+def to_mask(line):
+    return int(line.translate(MASK_DIGITS), 2)
 
-    def getT(self, row, col):
-        return self.grid[col][row]
+class Grid:
+    def __init__(self, text):
+        grid = FlatGrid(text.splitlines())
+        self.row_masks = [ to_mask(grid.row(r)) for r in range(grid.rows) ]
+        self.col_masks = [ to_mask(grid.column(c)) for c in range(grid.cols) ]
 
-    def transpose(self):
-        self.rows, self.cols = self.cols, self.rows
-        self.get,  self.getT = self.getT, self.get
-        return self
+def reflect_errors(masks, r, limit):
+    errors = 0
+    for i in range(min(r, len(masks) - r)):
+        errors += (masks[r - i - 1] ^ masks[r + i]).bit_count()
+        if errors > limit:
+            break
+    return errors
 
-    def row_errors(self, r0, r1):
-        return sum(1 for i in range(self.cols) if self.get(r0, i) != self.get(r1, i))
+def find_reflection(masks, errors):
+    return next((r for r in range(1, len(masks)) if reflect_errors(masks, r, errors) == errors), 0)
 
-    def hreflect_errors(self, r):
-        return sum(self.row_errors(r - i - 1, r + i) for i in range(min(r, self.rows - r)))
+def summary(grid, errors):
+    return find_reflection(grid.col_masks, errors) + 100 * find_reflection(grid.row_masks, errors)
 
-    def find_reflection(self, errors):
-        return next((r for r in range(1, self.rows) if self.hreflect_errors(r) == errors), 0)
+def summarize(work, n):
+    grids, errors = work
+    return summary(grids[n], errors)
 
 def solve(grids, errors):
-    def solve_one(grid):
-        return sum(weight * grid.transpose().find_reflection(errors) for weight in (1, 100))
-    return sum(solve_one(grid) for grid in grids)
+    return parallel.map_reduce(summarize, (grids, errors), len(grids))
 
 def solve_part1(grids):
     return solve(grids, 0)
@@ -38,10 +43,22 @@ def solve_part1(grids):
 def solve_part2(grids):
     return solve(grids, 1)
 
+def solve_sections(sections):
+    # one pattern at a time, as the sections stream past
+    part1 = part2 = 0
+    for grid in map(Grid, sections):
+        part1 += summary(grid, 0)
+        part2 += summary(grid, 1)
+    return part1, part2
+
 def parse_grids(text):
-    return [ Grid(grid) for grid in text.rstrip().split('\n\n') ]
+    return [ Grid(grid) for grid in tokens.sections(text) ]
+
+def parse(text):
+    return parse_grids(text)
 
-grids = parse_grids(''.join(fileinput.input()))
+if __name__ == '__main__':
+    grids = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(grids)}')
-print(f'Part 2: {solve_part2(grids)}')
+    print(f'Part 1: {solve_part1(grids)}')
+    print(f'Part 2: {solve_part2(grids)}')
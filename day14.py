@@ -2,46 +2,58 @@
 
 import fileinput
 
-class Grid:
-    def __init__(self, rows):
-        self.dim = len(rows)
-        assert(self.dim == len(rows[0]))
-        self.grid = [ list(row) for row in rows ]
+import backend
+from flatgrid import FlatGrid, LEFT, RIGHT, UP, DOWN
 
-    def __getitem__(self, key):
-        r, c = key
-        return self.grid[r][c]
+def roll(run):
+    rocks = run.count(b'O')
+    return b'O' * rocks + b'.' * (len(run) - rocks)
 
-    def __setitem__(self, key, val):
-        r, c = key
-        self.grid[r][c] = val
+class Grid(FlatGrid):
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.lines = { side: self.edge_slices(side) for side in (LEFT, RIGHT, UP, DOWN) }
 
     def key(self):
-        return tuple(tuple(row) for row in self.grid)
-
-    def tilt(self, transform):
-        for c in range(self.dim):
-            d = 0
-            for r in range(self.dim):
-                i = transform(r, c)
-                if self[i] == '#':
-                    d = r + 1
-                elif self[i] == 'O':
-                    j = transform(d, c)
-                    self[i], self[j] = self[j], self[i]
-                    d += 1
+        return bytes(self.cells)
+
+    @backend.dispatch(threshold=1000, cold_threshold=5000, size=lambda self, side: len(self.cells))
+    def tilt(self, side):
+        # rocks in each line roll toward the start of its slice
+        cells = self.cells
+        for line in self.lines[side]:
+            cells[line] = b'#'.join(map(roll, cells[line].split(b'#')))
+
+    @tilt.numpy
+    def tilt_numpy(self, side):
+        import numpy as np
+
+        # a writable view of the cells, turned so that rocks roll toward row 0
+        grid = self.as_array()
+        view = { UP: grid, DOWN: grid[::-1], LEFT: grid.T, RIGHT: grid.T[::-1] }[side]
+        rows, cols = view.shape
+
+        cube, rock = view == ord('#'), view == ord('O')
+        # number each run between cube rocks by its column and the cubes above
+        run = np.cumsum(cube, axis=0) * cols + np.arange(cols)
+        rocks = np.bincount(run[rock], minlength=(rows + 1) * cols)
+        # a cell's position in its run, counted from the cube that opens it
+        open_cells = np.cumsum(~cube, axis=0)
+        position = open_cells - np.maximum.accumulate(np.where(cube, open_cells, 0), axis=0) - 1
+        view[~cube] = ord('.')
+        view[~cube & (position < rocks[run])] = ord('O')
 
     def tilt_north(self):
-        self.tilt(lambda r, c: (r, c))
+        self.tilt(UP)
 
     def tilt_west(self):
-        self.tilt(lambda r, c: (c, r))
+        self.tilt(LEFT)
 
     def tilt_south(self):
-        self.tilt(lambda r, c: (self.dim - r - 1, c))
+        self.tilt(DOWN)
 
     def tilt_east(self):
-        self.tilt(lambda r, c: (c, self.dim - r - 1))
+        self.tilt(RIGHT)
 
     def spin_cycle(self):
         self.tilt_north()
@@ -50,10 +62,7 @@ class Grid:
         self.tilt_east()
 
     def total_load(self):
-        total = 0
-        for i, row in enumerate(self.grid):
-            total += (self.dim - i) * len([ cell for cell in row if cell == 'O' ])
-        return total
+        return sum((self.rows - r) * self.row(r).count(b'O') for r in range(self.rows))
 
 def solve_part1(rows):
     grid = Grid(rows)
@@ -78,7 +87,11 @@ def solve_part2(rows):
 
     return grid.total_load()
 
-rows = [ line.rstrip() for line in fileinput.input() ]
+def parse(text):
+    return [ line.rstrip() for line in text.splitlines() ]
+
+if __name__ == '__main__':
+    rows = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(rows)}')
-print(f'Part 2: {solve_part2(rows)}')
+    print(f'Part 1: {solve_part1(rows)}')
+    print(f'Part 2: {solve_part2(rows)}')
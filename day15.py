@@ -61,7 +61,11 @@ def solve_part2(steps):
             hashmap.set(label, int(value))
     return hashmap.total_focusing_power()
 
-steps = next(fileinput.input()).rstrip().split(',')
+def parse(text):
+    return text.splitlines()[0].rstrip().split(',')
 
-print(f'Part 1: {solve_part1(steps)}')
-print(f'Part 2: {solve_part2(steps)}')
+if __name__ == '__main__':
+    steps = parse(''.join(fileinput.input()))
+
+    print(f'Part 1: {solve_part1(steps)}')
+    print(f'Part 2: {solve_part2(steps)}')
@@ -2,70 +2,66 @@
 
 import fileinput
 from collections import namedtuple
+import parallel
+from flatgrid import FlatGrid, LEFT, RIGHT, UP, DOWN
 
-class Coord(namedtuple('Coord', ['row', 'col'])):
-    def __add__(self, other):
-        return Coord(self.row + other.row, self.col + other.col)
+OUTSIDE = ord(' ')
 
-    def encounter(self, tile):
-        match tile:
-            case '-':
-                return [ self ] if self.row == 0 else [ Coord(0, -1), Coord(0, 1) ]
-            case '|':
-                return [ self ] if self.col == 0 else [ Coord(-1, 0), Coord(1, 0) ]
-            case '/':
-                return [ Coord(-self.col, -self.row) ]
-            case '\\':
-                return [ Coord(self.col, self.row) ]
-            case _:
-                return [ self ]
+# headings leaving each tile, indexed by the heading the beam arrived with
+TURNS = {
+    ord('.'):  [ [ LEFT ], [ RIGHT ], [ UP ], [ DOWN ] ],
+    ord('-'):  [ [ LEFT ], [ RIGHT ], [ LEFT, RIGHT ], [ LEFT, RIGHT ] ],
+    ord('|'):  [ [ UP, DOWN ], [ UP, DOWN ], [ UP ], [ DOWN ] ],
+    ord('/'):  [ [ DOWN ], [ UP ], [ RIGHT ], [ LEFT ] ],
+    ord('\\'): [ [ UP ], [ DOWN ], [ LEFT ], [ RIGHT ] ],
+}
 
-class Beam(namedtuple('Beam', ['coord', 'heading'])):
-    def step(self):
-        return Beam(self.coord + self.heading, self.heading)
+Beam = namedtuple('Beam', ['index', 'heading'])
 
-    def encounter(self, tile):
-        return (Beam(self.coord, heading).step() for heading in self.heading.encounter(tile))
-
-class Grid:
+class Grid(FlatGrid):
     def __init__(self, rows):
-        self.dim = len(rows)
-        assert len(rows[0]) == self.dim, 'unimplemented non-square grid'
-        self.grid = rows
-
-    def __contains__(self, coord):
-        return 0 <= coord.row < self.dim and 0 <= coord.col < self.dim
-
-    def __getitem__(self, coord):
-        return self.grid[coord.row][coord.col]
+        super().__init__(rows, border=' ')
 
     def ingresses(self):
-        for start, delta in [ (0, +1), (self.dim - 1, -1) ]:
-            for i in range(self.dim):
-                yield Beam(Coord(start, i), Coord(delta, 0))
-                yield Beam(Coord(i, start), Coord(0, delta))
-
-def dfs(start, neighbors):
-    visited = set()
-    frontier = [ start ]
-    while any(frontier):
-        current = frontier.pop()
-        visited.add(current)
-        frontier.extend(n for n in neighbors(current) if n not in visited)
-    return visited
+        for c in range(self.cols):
+            yield Beam(self.index(0, c), DOWN)
+            yield Beam(self.index(self.rows - 1, c), UP)
+        for r in range(self.rows):
+            yield Beam(self.index(r, 0), RIGHT)
+            yield Beam(self.index(r, self.cols - 1), LEFT)
 
 def illuminate(grid, start):
-    def neighbors(beam):
-        return (n for n in beam.encounter(grid[beam.coord]) if n.coord in grid)
-    return len(set(beam.coord for beam in dfs(start, neighbors)))
+    # beam states are packed as index * 4 + heading; seen holds a heading bitmask per cell
+    cells, offsets = grid.cells, grid.offsets
+    seen = bytearray(len(cells))
+    frontier = [ start.index * 4 + start.heading ]
+    while frontier:
+        i, heading = divmod(frontier.pop(), 4)
+        if seen[i] >> heading & 1:
+            continue
+        seen[i] |= 1 << heading
+        for turn in TURNS[cells[i]][heading]:
+            j = i + offsets[turn]
+            if cells[j] != OUTSIDE and not seen[j] >> turn & 1:
+                frontier.append(j * 4 + turn)
+    return len(seen) - seen.count(0)
 
 def solve_part1(grid):
-    return illuminate(grid, Beam(Coord(0, 0), Coord(0, +1)))
+    return illuminate(grid, Beam(grid.index(0, 0), RIGHT))
+
+def illuminate_nth(work, n):
+    grid, starts = work
+    return illuminate(grid, starts[n])
 
 def solve_part2(grid):
-    return max(illuminate(grid, start) for start in grid.ingresses())
+    starts = list(grid.ingresses())
+    return parallel.map_reduce(illuminate_nth, (grid, starts), len(starts), reduce=max)
+
+def parse(text):
+    return Grid([ line.rstrip() for line in text.splitlines() ])
 
-grid = Grid([ line.rstrip() for line in fileinput.input() ])
+if __name__ == '__main__':
+    grid = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(grid)}')
-print(f'Part 2: {solve_part2(grid)}')
+    print(f'Part 1: {solve_part1(grid)}')
+    print(f'Part 2: {solve_part2(grid)}')
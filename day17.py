@@ -1,7 +1,9 @@
 #! /usr/bin/env python3
 
 import fileinput
-from collections import namedtuple, defaultdict
+from collections import defaultdict
+from flatgrid import FlatGrid
+from instrument import counters
 
 class BucketQueue:
     def __init__(self):
@@ -20,61 +22,67 @@ class BucketQueue:
                 yield self.cost, bucket.pop()
             self.cost += 1
 
-class Coord(namedtuple('Coord', ['row', 'col'])):
-    def __add__(self, other):
-        return Coord(self.row + other.row, self.col + other.col)
+class CountingBucketQueue(BucketQueue):
+    def put(self, cost, item):
+        if cost not in self.queue:
+            counters.add('queue buckets')
+        counters.add('queue pushes')
+        super().put(cost, item)
 
-    def turn(self):
-        yield Coord(-self.col, self.row)
-        yield Coord(self.col, -self.row)
+    def items(self):
+        for item in super().items():
+            counters.add('queue pops')
+            yield item
 
-Crucible = namedtuple('Crucible', ['coord', 'heading'])
+HORIZONTAL, VERTICAL = 0, 1
 
-class Grid:
-    def __init__(self, rows):
-        self.dim = len(rows)
-        assert self.dim == len(rows[0]), 'unimplemented non-square grid'
-        self.grid = rows
+HEAT_LOSS = bytes.maketrans(b'0123456789', bytes(range(10)))
 
-    def __contains__(self, coord):
-        return 0 <= coord.row < self.dim and 0 <= coord.col < self.dim
+# border byte around the city; HEAT_LOSS leaves it as is, far above any digit
+OUTSIDE = ord(' ')
 
-    def __getitem__(self, coord):
-        return self.grid[coord.row][coord.col]
+class Grid(FlatGrid):
+    def __init__(self, rows):
+        super().__init__(rows, border=chr(OUTSIDE))
+        self.loss = self.cells.translate(HEAT_LOSS)
+        self.axis_offsets = [ (1, -1), (self.width, -self.width) ]
 
 class Solver:
+    # a crucible is packed as index * 2 + the axis it moves along next
     def __init__(self, grid, stride):
         self.grid = grid
         self.stride = stride
 
     def neighbors(self, crucible):
-        coord, heading = crucible
-        delta = 0
-        for i in range(1, self.stride.stop):
-            coord += heading
-            if coord not in self.grid:
-                break
-            delta += self.grid[coord]
-            if i in self.stride:
-                for turn in heading.turn():
-                    yield delta, Crucible(coord, turn)
+        i, axis = divmod(crucible, 2)
+        loss = self.grid.loss
+        for offset in self.grid.axis_offsets[axis]:
+            j, delta = i, 0
+            for n in range(1, self.stride.stop):
+                j += offset
+                if loss[j] == OUTSIDE:
+                    break
+                delta += loss[j]
+                if n in self.stride:
+                    yield delta, j * 2 + 1 - axis
 
     def dijkstra(self):
-        queue = BucketQueue()
-        queue.put(0, Crucible(Coord(0, 0), Coord(0, 1)))
-        queue.put(0, Crucible(Coord(0, 0), Coord(1, 0)))
+        start = self.grid.index(0, 0)
+        queue = CountingBucketQueue() if counters.enabled else BucketQueue()
+        queue.put(0, start * 2 + HORIZONTAL)
+        queue.put(0, start * 2 + VERTICAL)
 
-        visited = set()
+        visited = bytearray(len(self.grid) * 2)
         for cost, state in queue.items():
-            if state not in visited:
+            if not visited[state]:
                 yield cost, state
-                visited.add(state)
+                visited[state] = 1
                 for delta, neighbor in self.neighbors(state):
                     queue.put(cost + delta, neighbor)
 
     def solve(self):
-        goal = Coord(grid.dim - 1, grid.dim - 1)
-        return next(cost for cost, state in self.dijkstra() if state.coord == goal)
+        goal = self.grid.index(self.grid.rows - 1, self.grid.cols - 1)
+        return next(cost for cost, state in self.dijkstra() if state // 2 == goal)
 
 def solve_part1(grid):
     return Solver(grid, range(1, 4)).solve()
@@ -83,9 +91,13 @@ def solve_part2(grid):
     return Solver(grid, range(4, 11)).solve()
 
 def parse_grid(lines):
-    return Grid([ list(map(int, line.rstrip())) for line in lines ])
+    return Grid([ line.rstrip() for line in lines ])
+
+def parse(text):
+    return parse_grid(text.splitlines())
 
-grid = parse_grid(fileinput.input())
+if __name__ == '__main__':
+    grid = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(grid)}')
-print(f'Part 2: {solve_part2(grid)}')
+    print(f'Part 1: {solve_part1(grid)}')
+    print(f'Part 2: {solve_part2(grid)}')
@@ -3,6 +3,8 @@
 import fileinput
 from collections import namedtuple
 
+import tokens
+
 class Coord(namedtuple('Coord', ['row', 'col'])):
     def __add__(self, other):
         return Coord(self.row + other.row, self.col + other.col)
@@ -16,28 +18,51 @@ class Step(namedtuple('Step', ['direction', 'distance', 'color'])):
     def decode(self):
         return Step(RDLU[self.color % 16], self.color // 16, 0)
 
+class Lagoon:
+    def __init__(self):
+        self.coord, self.perimeter, self.area = Coord(0, 0), 0, 0
+
+    def dig(self, step):
+        self.coord += step.direction * step.distance
+        self.perimeter += step.distance
+        self.area += self.coord.col * step.direction.row * step.distance
+
+    def size(self):
+        return abs(self.area) + self.perimeter // 2 + 1
+
 def solve_part1(steps):
-    coord, perimeter, area = Coord(0, 0), 0, 0
+    lagoon = Lagoon()
     for step in steps:
-        coord += step.direction * step.distance
-        perimeter += step.distance
-        area += coord.col * step.direction.row * step.distance
-    return abs(area) + perimeter // 2 + 1
+        lagoon.dig(step)
+    return lagoon.size()
 
 def solve_part2(steps):
     return solve_part1(step.decode() for step in steps)
 
-def parse_direction(direction):
-    return RDLU["RDLU".index(direction)]
+class Accumulator:
+    # both parts' shoelace sums, which more dig steps can extend at any time
+    def __init__(self):
+        self.lagoon, self.decoded = Lagoon(), Lagoon()
 
-def parse_color(color):
-    return int(color[2:-1], 16)
+    def feed(self, lines):
+        for step in map(parse_step, filter(bytes.strip, lines)):
+            self.lagoon.dig(step)
+            self.decoded.dig(step.decode())
+
+    def answers(self):
+        return self.lagoon.size(), self.decoded.size()
+
+DIRECTIONS = dict(zip(b'RDLU', RDLU))
 
 def parse_step(line):
-    direction, distance, color = line.rstrip().split()
-    return Step(parse_direction(direction), int(distance), parse_color(color))
+    direction, distance, color = line.split()
+    return Step(DIRECTIONS[direction[0]], int(distance), int(color[2:-1], 16))
+
+def parse(text):
+    return [ parse_step(line) for line in tokens.lines(text) ]
 
-steps = [ parse_step(line) for line in fileinput.input() ]
+if __name__ == '__main__':
+    steps = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(steps)}')
-print(f'Part 2: {solve_part2(steps)}')
+    print(f'Part 1: {solve_part1(steps)}')
+    print(f'Part 2: {solve_part2(steps)}')
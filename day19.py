@@ -3,54 +3,45 @@
 import fileinput
 import re
 
-class Interval:
-    def __init__(self, start, stop):
-        self.start = min(start, stop)
-        self.stop = stop
+import tokens
+from intervals import IntervalSet
 
-    def __and__(self, other):
-        return Interval(max(self.start, other.start), min(self.stop, other.stop))
-
-    def cut(self, n):
-        return Interval(self.start, n), Interval(n, self.stop)
-
-    def size(self):
-        return self.stop - self.start
-
-UNIVERSE = Interval(1, 4001)
+UNIVERSE = IntervalSet([ (1, 4001) ])
 
 class Part:
     def __init__(self, xmas):
         self.axes = xmas if type(xmas) == dict else dict(zip('xmas', xmas))
 
     def empty_part():
-        return Part([ Interval(0, 0) ] * 4)
+        return Part([ IntervalSet() ] * 4)
 
     def universal_part():
         return Part([ UNIVERSE ] * 4)
 
-    def constrain(self, category, interval):
-        return Part(self.axes | { category: self.axes[category] & interval })
+    def split(self, category, accept):
+        # the part of self the rule accepts, and the rest, which falls through
+        axis = self.axes[category]
+        return (Part(self.axes | { category: axis & accept }),
+                Part(self.axes | { category: axis - accept }))
 
     def volume(self):
         volume = 1
-        for interval in self.axes.values():
-            volume *= interval.size()
+        for axis in self.axes.values():
+            volume *= axis.size()
         return volume
 
     def rating(self):
-        return sum(interval.start for interval in self.axes.values())
+        return sum(axis.min() for axis in self.axes.values())
 
 class Rule:
-    def __init__(self, category=None, accept=None, reject=None):
+    def __init__(self, category=None, accept=None):
         self.category = category
         self.accept = accept
-        self.reject = reject
 
     def constrain(self, part):
         if self.category is None:
             return part, Part.empty_part()
-        return (part.constrain(self.category, interval) for interval in (self.accept, self.reject))
+        return part.split(self.category, self.accept)
 
 class WorkflowTree:
     def __init__(self, workflows):
@@ -68,18 +59,19 @@ class WorkflowTree:
 
         return volume
 
-def solve_part1(workflows, parts):
+def solve_part1(system):
+    workflows, parts = system
     return sum(part.rating() * workflows.accepted_volume(part) for part in parts)
 
-def solve_part2(workflows):
+def solve_part2(system):
+    workflows, _ = system
     return workflows.accepted_volume(Part.universal_part())
 
 def parse_inequality(relation, value):
     if relation == '<':
-        accept, reject = UNIVERSE.cut(value)
+        return UNIVERSE & IntervalSet([ (1, value) ])
     else:
-        reject, accept = UNIVERSE.cut(value + 1)
-    return accept, reject
+        return UNIVERSE & IntervalSet([ (value + 1, 4001) ])
 
 def parse_rule(rule):
     match = re.match(r'(?:([xmas])([<>])(\d+):)?(A|R|[a-z]+)', rule)
@@ -88,8 +80,7 @@ def parse_rule(rule):
     if category is None:
         return Rule(), target
     else:
-        accept, reject = parse_inequality(relation, int(value))
-        return Rule(category, accept, reject), target
+        return Rule(category, parse_inequality(relation, int(value))), target
 
 def parse_workflow(line):
     name, rule_list = re.match(r'([a-z]+){(.+)}', line).groups()
@@ -101,15 +92,24 @@ def parse_workflow_tree(section):
 
 def parse_part(line):
     numbers = map(int, re.findall(r'\d+', line))
-    return Part(Interval(n, n + 1) for n in numbers)
+    return Part(IntervalSet([ (n, n + 1) ]) for n in numbers)
 
 def parse_parts(section):
     return [ parse_part(line) for line in section.split('\n') ]
 
-workflows_section, parts_section = ''.join(fileinput.input()).rstrip().split('\n\n')
+def solve_sections(sections):
+    system = parse_sections(sections)
+    return solve_part1(system), solve_part2(system)
+
+def parse_sections(sections):
+    workflows_section, parts_section = (section.decode() for section in sections)
+    return parse_workflow_tree(workflows_section), parse_parts(parts_section)
+
+def parse(text):
+    return parse_sections(tokens.sections(text))
 
-workflows = parse_workflow_tree(workflows_section)
-parts = parse_parts(parts_section)
+if __name__ == '__main__':
+    system = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(workflows, parts)}')
-print(f'Part 2: {solve_part2(workflows)}')
+    print(f'Part 1: {solve_part1(system)}')
+    print(f'Part 2: {solve_part2(system)}')
@@ -4,6 +4,7 @@ import fileinput
 import re
 from queue import Queue
 from math import lcm
+from instrument import counters
 
 class Module:
     def __init__(self, glyph, outputs):
@@ -56,6 +57,8 @@ class Network:
                 return sender, module
 
     def push_button(self, callback=None):
+        if counters.enabled:
+            callback = counters.counting(callback or (lambda *pulse: None), 'pulses')
         queue = Queue()
         queue.put(('button', 'broadcaster', False))
         while not queue.empty():
@@ -110,7 +113,11 @@ def parse_module(line):
 def parse_network(lines):
     return Network(map(parse_module, lines))
 
-network = parse_network(line.rstrip() for line in fileinput.input())
+def parse(text):
+    return parse_network(line.rstrip() for line in text.splitlines())
 
-print(f'Part 1: {solve_part1(network)}')
-print(f'Part 2: {solve_part2(network)}')
+if __name__ == '__main__':
+    network = parse(''.join(fileinput.input()))
+
+    print(f'Part 1: {solve_part1(network)}')
+    print(f'Part 2: {solve_part2(network)}')
@@ -1,34 +1,35 @@
 #! /usr/bin/env python3
 
 import fileinput
-from collections import namedtuple
+from math import lcm
+from flatgrid import FlatGrid, DELTAS
 
-class Grid:
+ROCK = ord('#')
+
+# positions on the infinite tiling are packed as tile * len(grid) + index, where
+# tile = tile_row * TILE_SPAN + tile_col; every move is then a single addition
+TILE_SPAN = 1 << 32
+
+class Grid(FlatGrid):
     def __init__(self, rows):
-        self.dim = len(rows)
-        assert self.dim == len(rows[0]), 'unimplemented non-square grid'
-        self.start = None
-        self.grid = set()
-        self.populate_grid(rows)
-        assert self.start is not None
-
-    def populate_grid(self, rows):
-        for r, row in enumerate(rows):
-            for c, glyph in enumerate(row):
-                if glyph == 'S':
-                    assert self.start is None
-                    self.start = (r, c)
-                elif glyph == '#':
-                    self.grid.add((r, c))
-
-    def __contains__(self, coord):
-        mapped = (coord[0] % self.dim, coord[1] % self.dim)
-        return mapped in self.grid
-
-    def neighbors(self, coord):
-        r, c = coord
-        candidates = [ (r, c-1), (r, c+1), (r-1, c), (r+1, c) ]
-        return set(coord for coord in candidates if coord not in self)
+        super().__init__(rows)
+        assert self.cells.count(b'S') == 1
+        self.start = self.find('S')
+        self.moves = [ self.moves_from(i) for i in range(len(self)) ]
+
+    def moves_from(self, i):
+        r, c = self.coord(i)
+        moves = []
+        for dr, dc in DELTAS:
+            tile_r, r1 = divmod(r + dr, self.rows)
+            tile_c, c1 = divmod(c + dc, self.cols)
+            j = self.index(r1, c1)
+            if self.cells[j] != ROCK:
+                moves.append((tile_r * TILE_SPAN + tile_c) * len(self) + j - i)
+        return moves
+
+    def neighbors(self, position):
+        return [ position + move for move in self.moves[position % len(self)] ]
 
 class Stepper:
     def __init__(self, grid):
@@ -38,8 +39,8 @@ class Stepper:
 
     def step(self):
         neighbors = set()
-        for coord in self.frontier:
-            neighbors |= self.grid.neighbors(coord)
+        for position in self.frontier:
+            neighbors.update(self.grid.neighbors(position))
         self.frontier = neighbors - self.odd
         self.odd |= self.frontier
         self.even, self.odd = self.odd, self.even
@@ -59,7 +60,7 @@ def solve_part1(grid):
 
 def solve_part2(grid):
     goal = 26501365
-    leap = grid.dim * 2
+    leap = lcm(grid.rows, grid.cols) * 2
 
     stepper = Stepper(grid)
     stepper.step_many(goal % leap)
@@ -82,7 +83,11 @@ def solve_part2(grid):
 
     return (a*f[-1] - b*f[-2] + c*f[-3])
 
-grid = Grid([ line.rstrip() for line in fileinput.input() ])
+def parse(text):
+    return Grid([ line.rstrip() for line in text.splitlines() ])
+
+if __name__ == '__main__':
+    grid = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(grid)}')
-print(f'Part 2: {solve_part2(grid)}')
+    print(f'Part 1: {solve_part1(grid)}')
+    print(f'Part 2: {solve_part2(grid)}')
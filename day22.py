@@ -2,10 +2,14 @@
 
 import fileinput
 from collections import namedtuple, defaultdict
-import networkx as nx
+from functools import reduce
+
+import tokens
 
 Coord = namedtuple('Coord', list('xyz'))
 
+GROUND = (1, -1)
+
 class Brick:
     def __init__(self, start, end):
         self.x = Brick.to_range(start.x, end.x)
@@ -27,22 +31,34 @@ class Brick:
         self.z = range(z0, z0 + len(self.z))
         return self.z.stop
 
+def immediate_dominators(supports):
+    # bricks settle in order, so every support is visited before the bricks it holds up
+    idom, depth = { -1: -1 }, { -1: 0 }
+
+    def intersect(a, b):
+        while a != b:
+            if depth[a] < depth[b]:
+                a, b = b, a
+            a = idom[a]
+        return a
+
+    for i, below in enumerate(supports):
+        d = reduce(intersect, below)
+        idom[i], depth[i] = d, depth[d] + 1
+    return idom
+
 class Tower:
     def __init__(self, bricks):
-        self.heightmap = defaultdict(lambda: (1, -1))
-
-        G = nx.DiGraph()
-        for i, brick in enumerate(sorted(bricks)):
-            for support in self.settle(brick, i):
-                G.add_edge(support, i)
+        self.heightmap = { }
 
-        self.num_bricks = len(G.nodes) - 1
+        supports = [ set(self.settle(brick, i)) for i, brick in enumerate(sorted(bricks)) ]
+        self.num_bricks = len(supports)
 
-        dom = nx.immediate_dominators(G, -1)
+        dom = immediate_dominators(supports)
         self.dominators = [ (i, d) for i, d in dom.items() if d != -1 ]
 
     def settle(self, brick, i):
-        foundation = [ self.heightmap[x, y] for x, y in brick.footprint() ]
+        foundation = [ self.heightmap.get((x, y), GROUND) for x, y in brick.footprint() ]
 
         z0 = max(foundation)[0]
         yield from (support for z, support in foundation if z == z0)
@@ -61,16 +77,20 @@ class Tower:
             chain[d] += chain[i] + 1
         return sum(chain.values())
 
-def parse_coord(word):
-    return Coord(*map(int, word.split(',')))
+def parse_brick(row):
+    return Brick(Coord(*row[:3]), Coord(*row[3:]))
+
+def solve_part1(tower):
+    return tower.solve_part1()
 
-def parse_brick(line):
-    return Brick(*map(parse_coord, line.rstrip().split('~')))
+def solve_part2(tower):
+    return tower.solve_part2()
 
-def parse_tower(lines):
-    return Tower(map(parse_brick, lines))
+def parse(text):
+    return Tower(map(parse_brick, tokens.rows(text, 6)))
 
-tower = parse_tower(fileinput.input())
+if __name__ == '__main__':
+    tower = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {tower.solve_part1()}')
-print(f'Part 2: {tower.solve_part2()}')
+    print(f'Part 1: {solve_part1(tower)}')
+    print(f'Part 2: {solve_part2(tower)}')
@@ -2,49 +2,46 @@
 
 import fileinput
 from collections import defaultdict
-import networkx as nx
+from flatgrid import FlatGrid
+from instrument import counters
 
-class Grid:
+FOREST = ord('#')
+
+class Grid(FlatGrid):
     def __init__(self, rows):
-        self.dim = len(rows)
-        assert self.dim == len(rows[0]), 'unimplemented non-square grid'
-        self.grid = rows
-        assert self.grid[0][1] == self.grid[-1][-2] == '.'
-
-    def __contains__(self, coord):
-        r, c = coord
-        return 0 <= r < self.dim and 0 <= c < self.dim
-
-    def __getitem__(self, coord):
-        r, c = coord
-        return self.grid[r][c]
-
-    def neighbors(self, coord, prev):
-        r, c = coord
-        for neighbor in [ (r, c - 1), (r, c + 1), (r - 1, c), (r + 1, c) ]:
-            if neighbor not in self or neighbor == prev or self[neighbor] == '#':
-                continue
-            if self[neighbor] == '>' and neighbor[1] < c:
+        super().__init__(rows, border='#')
+        self.start = self.index(0, 1)
+        self.goal = self.index(self.rows - 1, self.cols - 2)
+        assert self.cells[self.start] == self.cells[self.goal] == ord('.')
+        # stepping left onto '>' or up onto 'v' would climb the slope
+        self.uphill = { -1: ord('>'), -self.width: ord('v') }
+
+    def neighbors(self, node, prev):
+        cells = self.cells
+        for offset in self.offsets:
+            neighbor = node + offset
+            if neighbor == prev or cells[neighbor] == FOREST:
                 continue
-            if self[neighbor] == 'v' and neighbor[0] < r:
+            if cells[neighbor] == self.uphill.get(offset):
                 continue
             yield neighbor
 
     def to_digraph(self):
-        start = (0, 1)
-        goal = (self.dim - 1, self.dim - 2)
+        import networkx as nx
+
+        start, goal = self.start, self.goal
 
         G = nx.DiGraph()
 
         visited = set()
-        stack = [ (start, start, (1, 1), 1) ]
+        stack = [ (start, start, start + self.width, 1) ]
         while len(stack) != 0:
             node0, prev, node, distance = stack.pop()
             if node in visited:
                 continue
             visited.add(node)
             for neighbor in self.neighbors(node, prev):
-                if (self[node] in '>v' and distance > 1) or neighbor == goal:
+                if (self.cells[node] in b'>v' and distance > 1) or neighbor == goal:
                     G.add_edge(node0, neighbor, weight=distance + 1)
                     stack.append((neighbor, node, neighbor, 0))
                 else:
@@ -72,7 +69,10 @@ def border_paths(G, start, goal):
 def weight(G, a, b):
     return G.get_edge_data(a, b)['weight']
 
-def solve_part1(G, start, goal):
+def solve_part1(trails):
+    import networkx as nx
+
+    G, start, goal = trails
     max_weight = 0
     for path in nx.simple_paths.all_simple_paths(G, start, goal):
         total_weight = 0
@@ -81,7 +81,11 @@ def solve_part1(G, start, goal):
         max_weight = max(max_weight, total_weight)
     return max_weight
 
-def solve_part2(G, start, goal):
+def solve_part2(trails):
+    import networkx as nx
+
+    G, start, goal = trails
+    G = G.copy()
     base_cost = 0
 
     # combine start node with its only successor
@@ -113,31 +117,41 @@ def solve_part2(G, start, goal):
     for path in border_paths(G, start, goal):
         for a, b in zip(path, path[1:]):
             forbidden_successors[b].append(a)
-    def prune(node, neighbor):
-        return neighbor in forbidden_successors[node]
+    def prune(node, neighbor, cost, best):
+        if neighbor in forbidden_successors[node]:
+            return True
+        # prune if we can't improve on the max
+        return neighbor != goal and cost + potential <= best
 
     def dfs(node, cost, best=0):
         nonlocal potential
         if node == goal:
             return max(best, cost)
-        # prune if we can't improve on the max
-        if cost + potential <= best:
-            return best
         potential -= heuristic[node]
         visited.add(node)
         for neighbor in G.neighbors(node):
-            if neighbor in visited or prune(node, neighbor):
+            if neighbor in visited:
                 continue
             w = weight(G, node, neighbor)
+            if prune(node, neighbor, cost + w, best):
+                continue
             best = max(best, dfs(neighbor, cost + w, best))
         visited.remove(node)
         potential += heuristic[node]
         return best
 
+    if counters.enabled:
+        dfs = counters.counting(dfs, 'dfs visited')
+        prune = counters.counting_true(prune, 'dfs pruned')
+
     return base_cost + dfs(start, 0)
 
-grid = Grid([ line.rstrip() for line in fileinput.input() ])
-G, start, goal = grid.to_digraph()
+def parse(text):
+    grid = Grid([ line.rstrip() for line in text.splitlines() ])
+    return grid.to_digraph()
+
+if __name__ == '__main__':
+    trails = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {solve_part1(G, start, goal)}')
-print(f'Part 2: {solve_part2(G, start, goal)}')
+    print(f'Part 1: {solve_part1(trails)}')
+    print(f'Part 2: {solve_part2(trails)}')
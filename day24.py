@@ -1,9 +1,12 @@
 #! /usr/bin/env python3
 
 import fileinput
-import re
-import sympy as sp
 import itertools
+from fractions import Fraction
+
+import backend
+import parallel
+import tokens
 
 class Vector:
     def __init__(self, v):
@@ -47,26 +50,123 @@ class Stone:
     def dist(self, other):
         return self.v.cross(other.v) * (other.p - self.p)
 
+LO, HI = 200000000000000, 400000000000000
+
+def crosses_in_area(a, b, lo=LO, hi=HI):
+    # The paths cross at times ta / d and tb / d, with d the cross product of
+    # the velocities, taken positive. The crossing point is compared against
+    # the area scaled by d, so everything stays in exact integers.
+    (ax, ay, _), (avx, avy, _) = a.p, a.v
+    (bx, by, _), (bvx, bvy, _) = b.p, b.v
+    d = avx * bvy - avy * bvx
+    if d == 0:
+        return False
+    dx, dy = bx - ax, by - ay
+    ta, tb = dx * bvy - dy * bvx, dx * avy - dy * avx
+    if d < 0:
+        d, ta, tb = -d, -ta, -tb
+
+    return (ta > 0 and tb > 0 and (lo - ax) * d <= ta * avx <= (hi - ax) * d
+            and (lo - ay) * d <= ta * avy <= (hi - ay) * d)
+
+def crossings_after(stones, i):
+    a = stones[i]
+    return sum(crosses_in_area(a, b) for b in itertools.islice(stones, i + 1, None))
+
+@backend.dispatch(threshold=20, cold_threshold=150)
 def solve_part1(stones):
-    lo, hi = 200000000000000, 400000000000000
-    count = 0
-
-    for a, b in itertools.combinations(stones, 2):
-        n = a.p[1] - b.p[1] + (b.p[0] - a.p[0]) * a.v[1] / a.v[0]
-        d = b.v[1] - a.v[1] * b.v[0] / a.v[0]
-        if d == 0:
-            continue
+    return parallel.map_reduce(crossings_after, stones, len(stones))
+
+# relative error allowed for the float64 products of crossings_after_numpy,
+# far above what the few roundings in each one can add up to
+TOLERANCE = 2.0**-40
+
+# positions and velocities that keep d, dx and dy of crosses_in_area in int64
+POSITION_LIMIT, VELOCITY_LIMIT = 2**60, 2**30
+
+def crossings_after_numpy(shared, i, lo=LO, hi=HI):
+    import numpy as np
+
+    # The terms of crosses_in_area, one stone against all later ones. d, dx
+    # and dy are exact in int64, but their products are not, so those are
+    # taken in float64 along with a bound on their error. A comparison is
+    # settled when its sides differ by more than that bound; the few pairs
+    # that some comparison leaves too close to call are redone exactly.
+    stones, (px, py, vx, vy) = shared
+    ax, ay, avx, avy = px[i], py[i], vx[i], vy[i]
+    bvx, bvy = vx[i + 1:], vy[i + 1:]
+    d = avx * bvy - avy * bvx
+    dx, dy = (px[i + 1:] - ax).astype(np.float64), (py[i + 1:] - ay).astype(np.float64)
+    sign = np.sign(d).astype(np.float64)
+    d = np.abs(d).astype(np.float64)
+    bvx, bvy = bvx.astype(np.float64), bvy.astype(np.float64)
+    ta, ta_size = sign * (dx * bvy - dy * bvx), np.abs(dx * bvy) + np.abs(dy * bvx)
+    tb, tb_size = sign * (dx * avy - dy * avx), np.abs(dx * avy) + np.abs(dy * avx)
+
+    sure = maybe = d != 0
+    for above, below, size in ((ta, 0, ta_size), (tb, 0, tb_size),
+                               (ta * avx, (lo - ax) * d, ta_size * abs(avx) + abs(lo - ax) * d),
+                               ((hi - ax) * d, ta * avx, ta_size * abs(avx) + abs(hi - ax) * d),
+                               (ta * avy, (lo - ay) * d, ta_size * abs(avy) + abs(lo - ay) * d),
+                               ((hi - ay) * d, ta * avy, ta_size * abs(avy) + abs(hi - ay) * d)):
+        error = TOLERANCE * size
+        sure = sure & (above - below > error)
+        maybe = maybe & (above - below >= -error)
+
+    close = np.flatnonzero(maybe & ~sure) + i + 1
+    return int(np.count_nonzero(sure)) + sum(crosses_in_area(stones[i], stones[j], lo, hi) for j in close.tolist())
+
+@solve_part1.numpy
+def solve_part1_numpy(stones):
+    import numpy as np
+
+    if (any(abs(n) >= POSITION_LIMIT for s in stones for n in s.p.v[:2])
+            or any(abs(n) >= VELOCITY_LIMIT for s in stones for n in s.v.v[:2])):
+        # d, dx or dy could pass int64
+        return solve_part1.python(stones)
+    px, py, vx, vy = np.array([ s.p.v[:2] + s.v.v[:2] for s in stones ], dtype=np.int64).reshape(-1, 4).T
+    return parallel.map_reduce(crossings_after_numpy, (stones, (px, py, vx, vy)), len(stones))
+
+def cross_matrix(u):
+    # rows of the matrix M such that M * w == u.cross(w)
+    return [ [ 0, -u[2], u[1] ], [ u[2], 0, -u[0] ], [ -u[1], u[0], 0 ] ]
+
+def solve_linear(rows):
+    rows = [ [ Fraction(n) for n in row ] for row in rows ]
+    size = len(rows)
+    for col in range(size):
+        pivot = next((r for r in range(col, size) if rows[r][col] != 0), None)
+        if pivot is None:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(size):
+            if r != col and rows[r][col] != 0:
+                factor = rows[r][col] / rows[col][col]
+                rows[r] = [ x - factor * y for x, y in zip(rows[r], rows[col]) ]
+    return [ rows[r][size] / rows[r][r] for r in range(size) ]
+
+def solve_rock(a, b, c):
+    # (p - s.p) x (v - s.v) == 0 for every stone s; subtracting the equations of
+    # two stones cancels p x v and leaves three equations linear in p and v
+    rows = []
+    for s, t in ((a, b), (a, c)):
+        p_coeffs = cross_matrix(t.v - s.v)
+        v_coeffs = cross_matrix(s.p - t.p)
+        rhs = s.p.cross(s.v) - t.p.cross(t.v)
+        for i in range(3):
+            rows.append(p_coeffs[i] + v_coeffs[i] + [ rhs[i] ])
+    return solve_linear(rows)
 
-        tb = n / d
-        cx, cy, _ = b.p + b.v * tb
-        ta = (cx - a.p[0]) / a.v[0]
-
-        if ta > 0 and tb > 0 and lo <= cx <= hi and lo <= cy <= hi:
-            count += 1
+def solve_part2(stones):
+    for a, b, c in zip(stones, stones[1:], stones[2:]):
+        solution = solve_rock(a, b, c)
+        if solution is not None and all(n.denominator == 1 for n in solution):
+            return int(sum(solution[:3]))
+    return solve_part2_symbolic(stones)
 
-    return count
+def solve_part2_symbolic(stones):
+    import sympy as sp
 
-def solve_part2(stones):
     a, b, c, d, e = stones[:5]
 
     def try_intersect(s, ta, tb):
@@ -81,11 +181,27 @@ def solve_part2(stones):
             rock_p = a.p + (a.v - rock_v) * time_a
             return sum(rock_p)
 
-def parse_stone(line):
-    px, py, pz, vx, vy, vz = map(int, re.findall(r'-?\d+', line))
-    return Stone((px, py, pz), (vx, vy, vz))
-
-stones = [ parse_stone(line) for line in fileinput.input() ]
-
-print(f'Part 1: {solve_part1(stones)}')
-print(f'Part 2: {solve_part2(stones)}')
+def solve_stream(lines):
+    # part 1 pairs every hailstone with every other, so unlike the other
+    # streaming days this one has to keep the stones it has seen
+    stones, crossings, rock = [ ], 0, None
+    for stone in map(parse_stone, map(tokens.integers, filter(bytes.strip, lines))):
+        crossings += sum(crosses_in_area(seen, stone) for seen in stones)
+        stones.append(stone)
+        if rock is None and len(stones) >= 3:
+            solution = solve_rock(*stones[-3:])
+            if solution is not None and all(n.denominator == 1 for n in solution):
+                rock = int(sum(solution[:3]))
+    return crossings, rock if rock is not None else solve_part2_symbolic(stones)
+
+def parse_stone(row):
+    return Stone(row[:3], row[3:])
+
+def parse(text):
+    return [ parse_stone(row) for row in tokens.rows(text, 6) ]
+
+if __name__ == '__main__':
+    stones = parse(''.join(fileinput.input()))
+
+    print(f'Part 1: {solve_part1(stones)}')
+    print(f'Part 2: {solve_part2(stones)}')
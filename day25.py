@@ -1,7 +1,6 @@
 #! /usr/bin/env python3
 
 import fileinput
-import networkx as nx
 import random
 
 class Graph:
@@ -11,6 +10,8 @@ class Graph:
         self.saved_edges = []
 
     def random_path(self):
+        import networkx as nx
+
         def sort(a, b):
             return (a, b) if a < b else (b, a)
         a = random.choice(self.nodes)
@@ -34,6 +35,8 @@ class Graph:
                 return common.pop()
 
     def solve_part1(self):
+        import networkx as nx
+
         while True:
             for i in range(3):
                 self.remove_temporarily(self.try_cut())
@@ -42,9 +45,12 @@ class Graph:
             self.restore()
 
         a, b = list(nx.connected_components(self.g))
+        self.restore()
         return len(a) * len(b)
 
 def parse_graph(lines):
+    import networkx as nx
+
     g = nx.Graph()
     for line in lines:
         src, *dsts = line.rstrip().split(' ')
@@ -52,6 +58,13 @@ def parse_graph(lines):
             g.add_edge(src[:-1], dst)
     return Graph(g)
 
-graph = parse_graph(fileinput.input())
+def solve_part1(graph):
+    return graph.solve_part1()
+
+def parse(text):
+    return parse_graph(text.splitlines())
+
+if __name__ == '__main__':
+    graph = parse(''.join(fileinput.input()))
 
-print(f'Part 1: {graph.solve_part1()}')
+    print(f'Part 1: {solve_part1(graph)}')
@@ -0,0 +1,71 @@
+LEFT, RIGHT, UP, DOWN = range(4)
+
+REVERSE = [ RIGHT, LEFT, DOWN, UP ]
+DELTAS = [ (0, -1), (0, 1), (-1, 0), (1, 0) ]
+
+def line_slice(start, step, count):
+    stop = start + step * count
+    return slice(start, stop if stop >= 0 else None, step)
+
+class FlatGrid:
+    # Cells live in one bytearray, row after row, addressed by integer index.
+    # An optional border of sentinel cells lets walks leave the grid without
+    # bounds checks: stepping off the edge lands on the border glyph.
+    def __init__(self, rows, border=None):
+        rows = [ row.encode() if isinstance(row, str) else bytes(row) for row in rows ]
+        self.rows, self.cols = len(rows), len(rows[0])
+        if any(len(row) != self.cols for row in rows):
+            raise ValueError('ragged grid')
+
+        self.pad = 0 if border is None else 1
+        self.width = self.cols + 2 * self.pad
+        edge = b'' if border is None else border.encode()
+        frame = [ edge * self.width ] * self.pad
+        self.cells = bytearray(b''.join(frame + [ edge + row + edge for row in rows ] + frame))
+        self.offsets = [ -1, 1, -self.width, self.width ]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, i):
+        return self.cells[i]
+
+    def __setitem__(self, i, value):
+        self.cells[i] = value
+
+    def index(self, r, c):
+        return (r + self.pad) * self.width + c + self.pad
+
+    def coord(self, i):
+        r, c = divmod(i, self.width)
+        return r - self.pad, c - self.pad
+
+    def find(self, glyph):
+        return self.cells.index(ord(glyph))
+
+    def row(self, r):
+        start = self.index(r, 0)
+        return bytes(self.cells[start:start + self.cols])
+
+    def column(self, c):
+        return bytes(self.cells[self.column_slice(c)])
+
+    def row_slice(self, r, reverse=False):
+        if reverse:
+            return line_slice(self.index(r, self.cols - 1), -1, self.cols)
+        return line_slice(self.index(r, 0), 1, self.cols)
+
+    def column_slice(self, c, reverse=False):
+        if reverse:
+            return line_slice(self.index(self.rows - 1, c), -self.width, self.rows)
+        return line_slice(self.index(0, c), self.width, self.rows)
+
+    def edge_slices(self, side):
+        # every row or column as a slice that starts at the given side
+        if side in (LEFT, RIGHT):
+            return [ self.row_slice(r, side == RIGHT) for r in range(self.rows) ]
+        return [ self.column_slice(c, side == DOWN) for c in range(self.cols) ]
+
+    def as_array(self):
+        import numpy as np
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(-1, self.width)
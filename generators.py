@@ -0,0 +1,524 @@
+#! /usr/bin/env python3
+
+import argparse
+import random
+import string
+import sys
+
+DIGIT_WORDS = [
+    'zero', 'one', 'two', 'three', 'four',
+    'five', 'six', 'seven', 'eight', 'nine' ]
+
+def gen_day01(n, rng):
+    lines = []
+    for _ in range(n):
+        parts = []
+        while len(parts) == 0 or rng.random() < 0.6:
+            choice = rng.random()
+            if choice < 0.4:
+                parts.append(''.join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 6))))
+            elif choice < 0.7:
+                parts.append(rng.choice(DIGIT_WORDS[1:]))
+            else:
+                parts.append(str(rng.randint(1, 9)))
+        parts.insert(rng.randint(0, len(parts)), str(rng.randint(1, 9)))
+        lines.append(''.join(parts))
+    return '\n'.join(lines) + '\n'
+
+def gen_day02(n, rng):
+    lines = []
+    for game in range(1, n + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample([ 'red', 'green', 'blue' ], rng.randint(1, 3))
+            draws.append(', '.join(f'{rng.randint(1, 20)} {color}' for color in colors))
+        lines.append(f'Game {game}: ' + '; '.join(draws))
+    return '\n'.join(lines) + '\n'
+
+def gen_day03(n, rng):
+    grid = [ [ '.' ] * n for _ in range(n) ]
+    for r in range(n):
+        c = rng.randint(0, 4)
+        while c < n:
+            if rng.random() < 0.15:
+                grid[r][c] = rng.choice('*#+$/=%@&-')
+                c += 2
+            else:
+                digits = str(rng.randint(1, 999))
+                if c + len(digits) > n:
+                    break
+                grid[r][c:c + len(digits)] = digits
+                c += len(digits) + 1
+            c += rng.randint(0, 6)
+    return '\n'.join(''.join(row) for row in grid) + '\n'
+
+def gen_day04(n, rng):
+    lines = []
+    for card in range(1, n + 1):
+        matches = rng.choice([ 0, 0, 0, 1, 2, 3, 5, 8, 10 ])
+        matches = min(matches, n - card)
+        winning = rng.sample(range(1, 100), 10)
+        held = rng.sample(winning, matches)
+        held += rng.sample([ x for x in range(1, 100) if x not in winning ], 25 - matches)
+        rng.shuffle(held)
+        left = ' '.join(f'{x:2}' for x in winning)
+        right = ' '.join(f'{x:2}' for x in held)
+        lines.append(f'Card {card:3}: {left} | {right}')
+    return '\n'.join(lines) + '\n'
+
+ALMANAC_STAGES = [
+    'seed', 'soil', 'fertilizer', 'water', 'light',
+    'temperature', 'humidity', 'location' ]
+
+def gen_day05(n, rng, seed_pairs=None):
+    seeds = []
+    for _ in range(seed_pairs or max(1, n // 4)):
+        seeds.extend([ rng.randint(0, 2**32), rng.randint(1, 2**28) ])
+    sections = [ 'seeds: ' + ' '.join(map(str, seeds)) ]
+    for src, dst in zip(ALMANAC_STAGES, ALMANAC_STAGES[1:]):
+        cuts = sorted(rng.sample(range(1, 2**32), 2 * n))
+        lines = []
+        for lo, hi in zip(cuts[::2], cuts[1::2]):
+            lines.append(f'{rng.randint(0, 2**32)} {lo} {hi - lo}')
+        rng.shuffle(lines)
+        sections.append(f'{src}-to-{dst} map:\n' + '\n'.join(lines))
+    return '\n\n'.join(sections) + '\n'
+
+def gen_day06(n, rng):
+    times, distances = [], []
+    for _ in range(max(3, n)):
+        time = rng.randint(50, 99)
+        times.append(time)
+        distances.append(rng.randint(100, min(999, time * time // 4 - 1)))
+    def row(label, numbers):
+        return f'{label:9}' + ''.join(f'{x:>7}' for x in numbers)
+    return row('Time:', times) + '\n' + row('Distance:', distances) + '\n'
+
+def gen_day07(n, rng):
+    lines = []
+    for _ in range(n):
+        kind = rng.randint(1, 5)
+        cards = rng.sample('23456789TJQKA', kind)
+        hand = [ rng.choice(cards) for _ in range(5 - kind) ] + cards
+        rng.shuffle(hand)
+        lines.append(''.join(hand) + ' ' + str(rng.randint(1, 1000)))
+    return '\n'.join(lines) + '\n'
+
+def node_names(rng, count, last_letters):
+    names, seen = [], set()
+    while len(names) < count:
+        length = 3 if count < 8000 else 4
+        name = ''.join(rng.choices(string.ascii_uppercase, k=length - 1)) + rng.choice(last_letters)
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+def lowercase_names(rng, count, exclude=()):
+    names, seen = [], set(exclude)
+    length = 2
+    while 26**length < 2 * (count + len(seen)):
+        length += 1
+    while len(names) < count:
+        name = ''.join(rng.choices(string.ascii_lowercase, k=length))
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+def gen_day08(n, rng):
+    moves = ''.join(rng.choice('LR') for _ in range(n))
+    primes = [ p for p in range(41, 200) if all(p % d for d in range(2, p)) ]
+    cycles = rng.sample(primes, 6)
+    middle = string.ascii_uppercase.replace('A', '').replace('Z', '')
+    total = sum(n * q for q in cycles)
+    names = iter(node_names(rng, total, middle))
+    starts = node_names(rng, 5, 'A')
+    starts = [ 'AAA' ] + [ s for s in starts if s != 'AAA' ][:5]
+    ends = [ 'ZZZ' ] + [ s for s in node_names(rng, 6, 'Z') if s != 'ZZZ' ][:5]
+    succ = { }
+    all_nodes = []
+    for start, end, q in zip(starts, ends, cycles):
+        chain = [ start ] + [ next(names) for _ in range(n * q - 1) ] + [ end ]
+        all_nodes.extend(chain)
+        for i, node in enumerate(chain[:-1]):
+            succ[node] = [ None, None ]
+            succ[node]['LR'.index(moves[i % n])] = chain[i + 1]
+        succ[end] = [ None, None ]
+        succ[end]['LR'.index(moves[0])] = chain[1]
+    for node, pair in succ.items():
+        for i in range(2):
+            if pair[i] is None:
+                pair[i] = rng.choice(all_nodes)
+    nodes = list(succ.items())
+    rng.shuffle(nodes)
+    lines = [ f'{node} = ({left}, {right})' for node, (left, right) in nodes ]
+    return moves + '\n\n' + '\n'.join(lines) + '\n'
+
+def gen_day09(n, rng):
+    lines = []
+    for _ in range(n):
+        coeffs = [ rng.randint(-9, 9) for _ in range(rng.randint(1, 8)) ]
+        values = [ sum(c * x**i for i, c in enumerate(coeffs)) for x in range(21) ]
+        lines.append(' '.join(map(str, values)))
+    return '\n'.join(lines) + '\n'
+
+def random_tree_region(k, rng):
+    region = set([ (0, 0) ])
+    frontier = [ (0, 0) ]
+    visited = set(frontier)
+    while frontier:
+        i = rng.randrange(len(frontier))
+        r, c = frontier[i]
+        options = [ (r + dr, c + dc) for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                    if 0 <= r + dr < k and 0 <= c + dc < k and (r + dr, c + dc) not in visited ]
+        if not options:
+            frontier[i] = frontier[-1]
+            frontier.pop()
+            continue
+        nr, nc = rng.choice(options)
+        visited.add((nr, nc))
+        frontier.append((nr, nc))
+        region.add((2 * nr, 2 * nc))
+        region.add((r + nr, c + nc))
+    return region
+
+def region_loop(region):
+    # lattice points on the boundary of a tree-shaped region of unit squares
+    def inside(r, c):
+        return (r, c) in region
+    edges = { }
+    def link(a, b, da, db):
+        edges.setdefault(a, []).append(da)
+        edges.setdefault(b, []).append(db)
+    rows = max(r for r, _ in region) + 2
+    cols = max(c for _, c in region) + 2
+    for a in range(rows):
+        for b in range(cols):
+            if inside(a - 1, b) != inside(a, b):
+                link((a, b), (a, b + 1), 'R', 'L')
+            if inside(a, b - 1) != inside(a, b):
+                link((a, b), (a + 1, b), 'D', 'U')
+    return edges
+
+def loop_order(edges):
+    delta = { 'R': (0, 1), 'L': (0, -1), 'D': (1, 0), 'U': (-1, 0) }
+    start = min(edges)
+    order, heading, cur = [], edges[start][0], start
+    while True:
+        order.append((cur, heading))
+        cur = (cur[0] + delta[heading][0], cur[1] + delta[heading][1])
+        if cur == start:
+            return order
+        opposite = { 'R': 'L', 'L': 'R', 'U': 'D', 'D': 'U' }[heading]
+        heading = next(d for d in edges[cur] if d != opposite)
+
+PIPE_GLYPHS = {
+    frozenset('UD'): '|', frozenset('LR'): '-', frozenset('LD'): '7',
+    frozenset('RD'): 'F', frozenset('LU'): 'J', frozenset('RU'): 'L' }
+
+def gen_day10(n, rng):
+    k = max(2, (n - 2) // 4)
+    region = set((2 * r + dr, 2 * c + dc) for r, c in random_tree_region(k, rng) for dr in (0, 1) for dc in (0, 1))
+    edges = region_loop(region)
+    grid = [ [ rng.choice('|-7FJL..') for _ in range(n) ] for _ in range(n) ]
+    for (r, c), dirs in edges.items():
+        grid[r + 1][c + 1] = PIPE_GLYPHS[frozenset(dirs)]
+    (sr, sc), dirs = rng.choice(list(edges.items()))
+    sr, sc = sr + 1, sc + 1
+    grid[sr][sc] = 'S'
+    for d, (dr, dc) in zip('UDLR', ((-1, 0), (1, 0), (0, -1), (0, 1))):
+        if (sr + dr - 1, sc + dc - 1) not in edges:
+            grid[sr + dr][sc + dc] = '.'
+    return '\n'.join(''.join(row) for row in grid) + '\n'
+
+def gen_day11(n, rng):
+    empty_rows = set(rng.sample(range(n), n // 15))
+    empty_cols = set(rng.sample(range(n), n // 15))
+    rows = []
+    for r in range(n):
+        rows.append(''.join(
+            '#' if r not in empty_rows and c not in empty_cols and rng.random() < 0.02 else '.'
+            for c in range(n)))
+    return '\n'.join(rows) + '\n'
+
+def gen_day12(n, rng):
+    lines = []
+    for _ in range(n):
+        length = rng.randint(3, 20)
+        springs = [ rng.choice('#..') for _ in range(length) ]
+        if '#' not in springs:
+            springs[rng.randrange(length)] = '#'
+        groups = [ len(g) for g in ''.join(springs).split('.') if g ]
+        masked = ''.join('?' if rng.random() < 0.5 else ch for ch in springs)
+        lines.append(masked + ' ' + ','.join(map(str, groups)))
+    return '\n'.join(lines) + '\n'
+
+def mirrored_pattern(rng):
+    rows, cols = rng.randint(5, 17), rng.randint(5, 17)
+    parent = { (r, c): (r, c) for r in range(rows) for c in range(cols) }
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    def union(a, b):
+        parent[find(a)] = find(b)
+    row_line = rng.randint(1, rows // 2)
+    col_line = rng.randint(1, cols - 1)
+    for r in range(row_line):
+        for c in range(cols):
+            union((r, c), (2 * row_line - 1 - r, c))
+    for c in range(col_line):
+        if 2 * col_line - 1 - c < cols:
+            for r in range(rows):
+                union((r, c), (r, 2 * col_line - 1 - c))
+    glyph = { }
+    grid = [ [ glyph.setdefault(find((r, c)), rng.choice('#.')) for c in range(cols) ] for r in range(rows) ]
+    return grid
+
+def gen_day13(n, rng):
+    patterns = []
+    for _ in range(n):
+        grid = mirrored_pattern(rng)
+        r, c = rng.randrange(len(grid)), rng.randrange(len(grid[0]))
+        if rng.random() < 0.5:
+            grid[r][c] = '#' if grid[r][c] == '.' else '.'
+        patterns.append('\n'.join(''.join(row) for row in grid))
+    return '\n\n'.join(patterns) + '\n'
+
+def gen_day14(n, rng):
+    rows = [ ''.join(rng.choices('.O#', weights=(14, 4, 2), k=n)) for _ in range(n) ]
+    return '\n'.join(rows) + '\n'
+
+def gen_day15(n, rng):
+    labels = [ ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6))) for _ in range(max(1, n // 8)) ]
+    steps = []
+    for _ in range(n):
+        label = rng.choice(labels)
+        steps.append(label + '-' if rng.random() < 0.3 else f'{label}={rng.randint(1, 9)}')
+    return ','.join(steps) + '\n'
+
+def gen_day16(n, rng):
+    rows = [ ''.join(rng.choices('./\\|-', weights=(40, 1, 1, 1, 1), k=n)) for _ in range(n) ]
+    return '\n'.join(rows) + '\n'
+
+def gen_day17(n, rng):
+    rows = [ ''.join(rng.choices('123456789', k=n)) for _ in range(n) ]
+    return '\n'.join(rows) + '\n'
+
+def monotone_axis(values, rng, lo, hi):
+    mapping, total = { }, 0
+    for value in sorted(values):
+        mapping[value] = total
+        total += rng.randint(lo, hi)
+    return mapping
+
+def gen_day18(n, rng):
+    order = loop_order(region_loop(random_tree_region(max(2, n), rng)))
+    corners = []
+    for i, (point, heading) in enumerate(order):
+        if heading != order[i - 1][1]:
+            corners.append((point, heading))
+    rows = set(p[0] for p, _ in corners)
+    cols = set(p[1] for p, _ in corners)
+    def steps(lo, hi):
+        row_map = monotone_axis(rows, rng, lo, hi)
+        col_map = monotone_axis(cols, rng, lo, hi)
+        result = []
+        for (p, heading), (q, _) in zip(corners, corners[1:] + corners[:1]):
+            length = abs(row_map[p[0]] - row_map[q[0]]) + abs(col_map[p[1]] - col_map[q[1]])
+            result.append((heading, length))
+        return result
+    lines = []
+    for (heading, length), (heading2, length2) in zip(steps(1, 12), steps(1000, 200000)):
+        color = length2 * 16 + 'RDLU'.index(heading2)
+        lines.append(f'{heading} {length} (#{color:06x})')
+    return '\n'.join(lines) + '\n'
+
+def gen_day19(n, rng):
+    names = [ 'in' ] + lowercase_names(rng, n - 1, exclude=[ 'in' ])
+    workflows, pending = [], [ names[0] ]
+    fresh = iter(names[1:])
+    while pending:
+        name = pending.pop(rng.randrange(len(pending)))
+        rules = []
+        for _ in range(rng.randint(1, 3)):
+            target = next(fresh, None) if rng.random() < 0.5 else None
+            if target is None:
+                target = rng.choice('AR')
+            else:
+                pending.append(target)
+            category = rng.choice('xmas')
+            relation = rng.choice('<>')
+            rules.append(f'{category}{relation}{rng.randint(1, 4000)}:{target}')
+        target = next(fresh, None) if rng.random() < 0.5 else None
+        if target is None:
+            target = rng.choice('AR')
+        else:
+            pending.append(target)
+        rules.append(target)
+        workflows.append(f'{name}{{{",".join(rules)}}}')
+    parts = []
+    for _ in range(max(1, n // 2)):
+        x, m, a, s = (rng.randint(1, 4000) for _ in range(4))
+        parts.append(f'{{x={x},m={m},a={a},s={s}}}')
+    return '\n'.join(workflows) + '\n\n' + '\n'.join(parts) + '\n'
+
+def gen_day20(n, rng):
+    names = iter(lowercase_names(rng, 14 * n + 1, exclude=[ 'rx', 'broadcaster' ]))
+    feeder = next(names)
+    lines = []
+    heads = []
+    for _ in range(n):
+        period = rng.randrange(2049, 4096, 2)
+        bits = [ next(names) for _ in range(12) ]
+        hub, inverter = next(names), next(names)
+        heads.append(bits[0])
+        hub_outputs = [ inverter ]
+        for j, bit in enumerate(bits):
+            outputs = []
+            if j + 1 < len(bits):
+                outputs.append(bits[j + 1])
+            if period >> j & 1:
+                outputs.append(hub)
+            if j == 0 or not period >> j & 1:
+                hub_outputs.append(bit)
+            lines.append(f'%{bit} -> ' + ', '.join(outputs))
+        lines.append(f'&{hub} -> ' + ', '.join(hub_outputs))
+        lines.append(f'&{inverter} -> {feeder}')
+    lines.append(f'&{feeder} -> rx')
+    lines.append('broadcaster -> ' + ', '.join(heads))
+    rng.shuffle(lines)
+    return '\n'.join(lines) + '\n'
+
+def gen_day21(n, rng):
+    dim = n | 1
+    mid = dim // 2
+    rows = []
+    for r in range(dim):
+        row = []
+        for c in range(dim):
+            clear = r in (0, mid, dim - 1) or c in (0, mid, dim - 1) or abs(r - mid) + abs(c - mid) == mid
+            row.append('.' if clear or rng.random() > 0.1 else '#')
+        rows.append(row)
+    rows[mid][mid] = 'S'
+    return '\n'.join(''.join(row) for row in rows) + '\n'
+
+def gen_day22(n, rng):
+    occupied = set()
+    bricks = []
+    height = max(10, n // 3)
+    while len(bricks) < n:
+        x, y, z = rng.randint(0, 9), rng.randint(0, 9), rng.randint(1, height)
+        axis, length = rng.randrange(3), rng.randint(0, 4)
+        end = [ x, y, z ]
+        end[axis] += length
+        if end[0] > 9 or end[1] > 9:
+            continue
+        cells = set()
+        for i in range(length + 1):
+            cell = [ x, y, z ]
+            cell[axis] += i
+            cells.add(tuple(cell))
+        if cells & occupied:
+            continue
+        occupied |= cells
+        bricks.append(f'{x},{y},{z}~{end[0]},{end[1]},{end[2]}')
+    return '\n'.join(bricks) + '\n'
+
+def gen_day23(n, rng, k=6):
+    dim = max(n, 6 * k + 4)
+    def spread(lo, hi):
+        gaps = [ 6 ] * (k - 1)
+        for _ in range(hi - lo - sum(gaps)):
+            gaps[rng.randrange(k - 1)] += 1
+        coords = [ lo ]
+        for gap in gaps:
+            coords.append(coords[-1] + gap)
+        return coords
+    R = spread(3, dim - 4)
+    C = spread(1, dim - 2)
+    grid = [ [ '#' ] * dim for _ in range(dim) ]
+    def open_cells(cells):
+        for r, c in cells:
+            grid[r][c] = '.'
+    open_cells((r, 1) for r in range(0, R[0]))
+    open_cells((r, dim - 2) for r in range(R[-1], dim))
+    for i in range(k):
+        for j in range(k):
+            grid[R[i]][C[j]] = '.'
+            if j + 1 < k:
+                a, b = C[j] + 2, C[j + 1] - 2
+                depth = rng.randint(0, (R[i + 1] - R[i] - 2) if i + 1 < k else 0)
+                open_cells((R[i], c) for c in range(C[j] + 1, a + 1))
+                open_cells((R[i], c) for c in range(b, C[j + 1]))
+                open_cells((r, a) for r in range(R[i], R[i] + depth + 1))
+                open_cells((r, b) for r in range(R[i], R[i] + depth + 1))
+                open_cells((R[i] + depth, c) for c in range(a, b + 1))
+                grid[R[i]][C[j] + 1] = grid[R[i]][C[j + 1] - 1] = '>'
+            if i + 1 < k:
+                open_cells((r, C[j]) for r in range(R[i] + 1, R[i + 1]))
+                grid[R[i] + 1][C[j]] = grid[R[i + 1] - 1][C[j]] = 'v'
+    grid[R[0] - 1][1] = 'v'
+    grid[R[-1] + 1][dim - 2] = 'v'
+    return '\n'.join(''.join(row) for row in grid) + '\n'
+
+def gen_day24(n, rng):
+    rock_p = [ rng.randint(2 * 10**14, 4 * 10**14) for _ in range(3) ]
+    rock_v = [ rng.randint(-300, 300) for _ in range(3) ]
+    lines, times = [], rng.sample(range(10**11, 10**12), n)
+    for t in times:
+        v = [ 0, 0, 0 ]
+        while 0 in v or v == rock_v:
+            v = [ rng.randint(-400, 400) for _ in range(3) ]
+        p = [ rp + (rv - sv) * t for rp, rv, sv in zip(rock_p, rock_v, v) ]
+        lines.append(', '.join(map(str, p)) + ' @ ' + ', '.join(map(str, v)))
+    return '\n'.join(lines) + '\n'
+
+def gen_day25(n, rng):
+    names = lowercase_names(rng, n)
+    half = n // 2
+    edges = set()
+    for group in (names[:half], names[half:]):
+        for i, a in enumerate(group):
+            for b in rng.sample(group, min(len(group) - 1, 5)):
+                if a != b:
+                    edges.add((min(a, b), max(a, b)))
+    for a, b in zip(rng.sample(names[:half], 3), rng.sample(names[half:], 3)):
+        edges.add((min(a, b), max(a, b)))
+    adjacency = { }
+    for a, b in edges:
+        adjacency.setdefault(a, []).append(b)
+    return '\n'.join(f'{a}: ' + ' '.join(bs) for a, bs in adjacency.items()) + '\n'
+
+GENERATORS = {
+    1: (1000, gen_day01), 2: (100, gen_day02), 3: (140, gen_day03),
+    4: (200, gen_day04), 5: (40, gen_day05), 6: (4, gen_day06),
+    7: (1000, gen_day07), 8: (13, gen_day08), 9: (200, gen_day09),
+    10: (140, gen_day10), 11: (140, gen_day11), 12: (1000, gen_day12),
+    13: (100, gen_day13), 14: (100, gen_day14), 15: (4000, gen_day15),
+    16: (110, gen_day16), 17: (141, gen_day17), 18: (20, gen_day18),
+    19: (500, gen_day19), 20: (4, gen_day20), 21: (131, gen_day21),
+    22: (1200, gen_day22), 23: (141, gen_day23), 24: (300, gen_day24),
+    25: (1500, gen_day25) }
+
+def size_of(day, scale):
+    base, _ = GENERATORS[day]
+    return max(1, round(base * scale))
+
+def generate(day, scale=1, seed=0):
+    _, generator = GENERATORS[day]
+    return generator(size_of(day, scale), random.Random(f'{day}:{scale}:{seed}'))
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic puzzle inputs')
+    parser.add_argument('day', type=int, choices=GENERATORS)
+    parser.add_argument('-s', '--scale', type=float, default=1,
+                        help='multiple of the puzzle-sized input (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    sys.stdout.write(generate(args.day, args.scale, args.seed))
+
+if __name__ == '__main__':
+    main()
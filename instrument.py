@@ -0,0 +1,91 @@
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+class Counters:
+    # Hot loops never consult this object. Instrumented code checks `enabled`
+    # once per call and only then swaps in counting variants of its queues,
+    # callbacks or recursive helpers, so a disabled run pays nothing.
+    def __init__(self):
+        self.enabled = False
+        self.counts = Counter()
+
+    def add(self, name, n=1):
+        self.counts[name] += n
+
+    def counting(self, fn, name):
+        def counted(*args):
+            self.counts[name] += 1
+            return fn(*args)
+        return counted
+
+    def counting_true(self, predicate, name):
+        def counted(*args):
+            result = predicate(*args)
+            if result:
+                self.counts[name] += 1
+            return result
+        return counted
+
+    def take(self):
+        counts = dict(self.counts)
+        self.counts.clear()
+        return counts
+
+counters = Counters()
+
+@contextmanager
+def cprofile(path):
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+
+def frame_stack(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
+
+@contextmanager
+def sample(path, interval=0.001):
+    # samples the calling thread's stack and writes it in collapsed form,
+    # one 'outer;inner;leaf count' line per distinct stack, for flame graphs
+    stacks = Counter()
+    target = threading.get_ident()
+    done = threading.Event()
+
+    def sampler():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(target)
+            if frame is not None:
+                stacks[frame_stack(frame)] += 1
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(interval)
+    thread = threading.Thread(target=sampler, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+        sys.setswitchinterval(switch_interval)
+        with open(path, 'w') as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f'{stack} {count}\n')
+
+PROFILERS = { 'cprofile': (cprofile, 'prof'), 'sample': (sample, 'folded') }
+
+def profiler(kind, directory):
+    profile, extension = PROFILERS[kind]
+    os.makedirs(directory, exist_ok=True)
+    return lambda label: profile(os.path.join(directory, f'{label}.{extension}'))
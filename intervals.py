@@ -0,0 +1,77 @@
+def coalesce(ranges):
+    # sorted (lo, hi) pairs as flat bounds, dropping empty ranges and merging
+    # any that overlap or touch
+    bounds = [ ]
+    for lo, hi in ranges:
+        if hi <= lo:
+            continue
+        if bounds and lo <= bounds[-1]:
+            if hi > bounds[-1]:
+                bounds[-1] = hi
+        else:
+            bounds += (lo, hi)
+    return bounds
+
+class IntervalSet:
+    # Sorted, disjoint and non-touching intervals, kept as one flat list of
+    # bounds [lo0, hi0, lo1, hi1, ...]. Every operation returns a coalesced
+    # set, so the interval count never exceeds the number of distinct gaps.
+    __slots__ = ('bounds',)
+
+    def __init__(self, ranges=()):
+        self.bounds = coalesce(sorted(ranges))
+
+    @classmethod
+    def from_bounds(cls, bounds):
+        interval_set = cls.__new__(cls)
+        interval_set.bounds = bounds
+        return interval_set
+
+    def __repr__(self):
+        return f'IntervalSet({list(self.ranges())})'
+
+    def __len__(self):
+        return len(self.bounds) // 2
+
+    def __bool__(self):
+        return len(self.bounds) != 0
+
+    def ranges(self):
+        return zip(self.bounds[::2], self.bounds[1::2])
+
+    def size(self):
+        return sum(hi - lo for lo, hi in self.ranges())
+
+    def min(self):
+        return self.bounds[0]
+
+    def __and__(self, other):
+        a, b = self.bounds, other.bounds
+        bounds, i, j = [ ], 0, 0
+        while i < len(a) and j < len(b):
+            lo, hi = max(a[i], b[j]), min(a[i + 1], b[j + 1])
+            if lo < hi:
+                bounds += (lo, hi)
+            if a[i + 1] < b[j + 1]:
+                i += 2
+            else:
+                j += 2
+        return IntervalSet.from_bounds(bounds)
+
+    def __sub__(self, other):
+        # each range of self, cut around the ranges of other that overlap it
+        a, b = self.bounds, other.bounds
+        bounds, j = [ ], 0
+        for i in range(0, len(a), 2):
+            lo, hi = a[i], a[i + 1]
+            while j < len(b) and b[j + 1] <= lo:
+                j += 2
+            k = j
+            while k < len(b) and b[k] < hi:
+                if lo < b[k]:
+                    bounds += (lo, b[k])
+                lo = max(lo, b[k + 1])
+                k += 2
+            if lo < hi:
+                bounds += (lo, hi)
+        return IntervalSet.from_bounds(bounds)
@@ -0,0 +1,64 @@
+import os
+import sys
+
+from instrument import counters
+
+# Worker count for map_reduce, set from $AOC_JOBS or runner.py --jobs; 0 means
+# one per available CPU, and 1 keeps every solve serial in the calling process.
+jobs = int(os.environ.get('AOC_JOBS', 1))
+
+# more chunks than workers evens out items that differ in cost
+CHUNKS_PER_WORKER = 4
+
+_work = None
+
+def available_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def free_threaded():
+    return not getattr(sys, '_is_gil_enabled', lambda: True)()
+
+def install(fn, shared, counting):
+    global _work
+    _work = fn, shared
+    # a forked worker starts with a copy of the caller's counts so far
+    counters.enabled = counting
+    counters.take()
+
+def run_chunk(indices, reduce):
+    # the chunk's result, with the work counted in it to send back
+    fn, shared = _work
+    return reduce(fn(shared, i) for i in indices), counters.take()
+
+def gather(chunks):
+    # results of run_chunk, their counts added to this process's counters
+    for result, counts in chunks:
+        for name, n in counts.items():
+            counters.add(name, n)
+        yield result
+
+def map_reduce(fn, shared, count, reduce=sum):
+    # Computes reduce(fn(shared, i) for i in range(count)) across workers:
+    # processes, or threads on builds without a GIL. Workers receive `shared`
+    # once when they start, then only strided index ranges, which also
+    # balances triangular loops where early items carry the most work.
+    workers = min(jobs or available_cpus(), count)
+    if workers <= 1:
+        return reduce(fn(shared, i) for i in range(count))
+
+    chunks = min(count, workers * CHUNKS_PER_WORKER)
+    ranges = [ range(k, count, chunks) for k in range(chunks) ]
+    if free_threaded():
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(workers) as executor:
+            return reduce(executor.map(lambda indices: reduce(fn(shared, i) for i in indices), ranges))
+
+    import multiprocessing
+    if multiprocessing.current_process().daemon:
+        # e.g. inside the solver daemon's pool, which may not have children
+        return reduce(fn(shared, i) for i in range(count))
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers, initializer=install, initargs=(fn, shared, counters.enabled)) as executor:
+        return reduce(gather(executor.map(run_chunk, ranges, [ reduce ] * chunks)))
@@ -0,0 +1,165 @@
+#! /usr/bin/env python3
+
+import argparse
+import importlib
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import nullcontext
+
+import backend
+import instrument
+import parallel
+import tokens
+from cache import Cache
+from instrument import counters
+
+DAYS = range(1, 26)
+PARTS = [ 'solve_part1', 'solve_part2' ]
+
+Stage = namedtuple('Stage', ['name', 'result', 'wall', 'cpu', 'peak', 'counters'], defaults=[None])
+
+def load_day(day):
+    return importlib.import_module(f'day{day:02}')
+
+def measure(name, fn, *args, memory=False, probe=None):
+    counters.take()
+    with nullcontext() if probe is None else probe(name):
+        if memory:
+            tracemalloc.start()
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = fn(*args)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        peak = None
+        if memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return Stage(name, result, wall, cpu, peak, counters.take() if counters.enabled else None)
+
+def solve(module, text, memory=False, cache=None, profile=None):
+    # profile, if given, maps a label such as 'day17-part1' to a context
+    # manager wrapped around that stage
+    probe = None if profile is None else lambda stage: profile(f'{module.__name__}-{stage}')
+    parsed = None
+    if cache is not None:
+        key = cache.key(module, text)
+        hit = measure('cache', cache.get, key, 'answers', memory=memory)
+        if hit.result is not None:
+            answers = [ Stage(f'part{part}', answer, 0, 0, None) for part, answer in enumerate(hit.result, 1) ]
+            return [ hit._replace(result=None) ] + answers
+        parsed = measure('cache', cache.get, key, 'parsed', memory=memory)
+        if parsed.result is None:
+            parsed = None
+
+    if parsed is None:
+        parsed = measure('parse', module.parse, text, memory=memory, probe=probe)
+        if cache is not None and parsed.wall >= cache.min_parse_seconds:
+            cache.put(key, 'parsed', parsed.result)
+
+    stages = [ parsed ]
+    for part, name in enumerate(PARTS, 1):
+        if hasattr(module, name):
+            stages.append(measure(f'part{part}', getattr(module, name), parsed.result, memory=memory, probe=probe))
+    if cache is not None:
+        cache.put(key, 'answers', [ stage.result for stage in stages[1:] ])
+    return stages
+
+def accumulate(module, lines):
+    # feeds every line into a fresh module.Accumulator, for the days that
+    # keep running totals rather than a solve_stream of their own
+    accumulator = module.Accumulator()
+    accumulator.feed(lines)
+    return accumulator.answers()
+
+def streams(module):
+    return any(hasattr(module, name) for name in ('solve_sections', 'solve_stream', 'Accumulator'))
+
+def stream(module, path, memory=False, profile=None):
+    # One pass over the input file that solves both parts together in bounded
+    # memory. Line-oriented days read it line by line; blank-line-delimited
+    # days read it section by section from a memory map.
+    probe = None if profile is None else lambda stage: profile(f'{module.__name__}-{stage}')
+    if hasattr(module, 'solve_sections'):
+        stage = measure('stream', module.solve_sections, tokens.mapped_sections(path), memory=memory, probe=probe)
+    else:
+        with open(path, 'rb') as f:
+            if hasattr(module, 'solve_stream'):
+                stage = measure('stream', module.solve_stream, f, memory=memory, probe=probe)
+            else:
+                stage = measure('stream', accumulate, module, f, memory=memory, probe=probe)
+    answers = [ Stage(f'part{part}', answer, 0, 0, None) for part, answer in enumerate(stage.result, 1) ]
+    return [ stage._replace(result=None) ] + answers
+
+def parse_days(spec):
+    days = []
+    for item in spec.split(','):
+        lo, _, hi = item.partition('-')
+        days.extend(range(int(lo), int(hi or lo) + 1))
+    for day in days:
+        if day not in DAYS:
+            raise argparse.ArgumentTypeError(f'no such day: {day}')
+    return days
+
+def format_stage(stage):
+    line = f'  {stage.name:6} wall {stage.wall * 1000:10.3f} ms  cpu {stage.cpu * 1000:10.3f} ms'
+    if stage.peak is not None:
+        line += f'  peak {stage.peak / 1024:10.1f} KiB'
+    for name, count in sorted((stage.counters or { }).items()):
+        line += f'\n    {name:24} {count:12}'
+    return line
+
+def main():
+    parser = argparse.ArgumentParser(description='Run Advent of Code 2023 solutions')
+    parser.add_argument('days', nargs='?', type=parse_days, default=list(DAYS),
+                        help='days to run, e.g. 5 or 1-10,12 (default: all)')
+    parser.add_argument('-i', '--input', default='input/day{day:02}.txt',
+                        help='input path template (default: %(default)s)')
+    parser.add_argument('-t', '--timing', action='store_true',
+                        help='report wall and CPU time per stage')
+    parser.add_argument('-m', '--memory', action='store_true',
+                        help='report peak traced memory per stage (slows solving down)')
+    parser.add_argument('-c', '--cache', nargs='?', const='', metavar='DIR',
+                        help='reuse answers and parsed inputs cached on disk (default DIR: $AOC_CACHE_DIR or ~/.cache/advent2023)')
+    parser.add_argument('--cache-size', type=int, default=256, metavar='MIB',
+                        help='evict least recently used cache entries beyond this size (default: %(default)s)')
+    parser.add_argument('-s', '--stream', action='store_true',
+                        help='read the input in one bounded-memory pass on days that support it')
+    parser.add_argument('-r', '--run-length', type=int, metavar='N',
+                        help='with --stream, sort externally in runs of N records spilled to disk on days that can (default: $AOC_RUN_LENGTH or in memory)')
+    parser.add_argument('-b', '--backend', choices=backend.BACKENDS, default=backend.override,
+                        help='Python or NumPy implementations where a day has both (default: $AOC_BACKEND or auto, by input size)')
+    parser.add_argument('-j', '--jobs', type=int, default=parallel.jobs,
+                        help='worker processes for days that split a solve, 0 for one per CPU (default: $AOC_JOBS or 1)')
+    parser.add_argument('-n', '--counters', action='store_true',
+                        help='report work counters per stage, e.g. queue pushes or memo hits')
+    parser.add_argument('-p', '--profile', choices=instrument.PROFILERS,
+                        help='profile each stage with cProfile or a stack sampler')
+    parser.add_argument('--profile-dir', default='profiles', metavar='DIR',
+                        help='where per-stage profiles are written (default: %(default)s)')
+    args = parser.parse_args()
+    cache = None if args.cache is None else Cache(args.cache, args.cache_size * 2**20)
+    profile = None if args.profile is None else instrument.profiler(args.profile, args.profile_dir)
+    counters.enabled = args.counters
+    backend.override = args.backend
+    parallel.jobs = args.jobs
+
+    for day in args.days:
+        if len(args.days) > 1:
+            print(f'Day {day:02}')
+        module, path = load_day(day), args.input.format(day=day)
+        if args.run_length is not None and hasattr(module, 'run_length'):
+            module.run_length = args.run_length
+        if args.stream and streams(module):
+            stages = stream(module, path, memory=args.memory, profile=profile)
+        else:
+            with open(path) as f:
+                text = f.read()
+            stages = solve(module, text, memory=args.memory, cache=cache, profile=profile)
+        for part, stage in enumerate(stages[1:], 1):
+            print(f'Part {part}: {stage.result}')
+        if args.timing or args.memory or args.counters:
+            for stage in stages:
+                print(format_stage(stage))
+
+if __name__ == '__main__':
+    main()
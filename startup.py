@@ -0,0 +1,72 @@
+#! /usr/bin/env python3
+
+import argparse
+import re
+import subprocess
+import sys
+
+import runner
+
+DEFAULT_BUDGET_MS = 50
+
+IMPORTTIME_LINE = re.compile(r'import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)')
+
+def parse_budgets(specs):
+    budgets = { }
+    for spec in specs:
+        day, _, ms = spec.partition('=')
+        budgets[int(day)] = float(ms)
+    return budgets
+
+def importtime_entries(day):
+    result = subprocess.run([ sys.executable, '-X', 'importtime', '-c', f'import day{day:02}' ],
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            yield (len(match[3]) - 1) // 2, int(match[2]), match[4]
+
+def import_time(day):
+    # cumulative microseconds spent importing dayNN and everything it pulls in
+    return next(us for depth, us, name in importtime_entries(day) if name == f'day{day:02}')
+
+def slowest_imports(day, count):
+    # children are listed just before their parent, one level deeper
+    entries = list(importtime_entries(day))
+    end = next(i for i, (_, _, name) in enumerate(entries) if name == f'day{day:02}')
+    start = end
+    while start > 0 and entries[start - 1][0] > 0:
+        start -= 1
+    children = [ (us, name) for depth, us, name in entries[start:end] if depth == 1 ]
+    return sorted(children, reverse=True)[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description='Check per-day import time against a budget')
+    parser.add_argument('days', nargs='?', type=runner.parse_days, default=list(runner.DAYS))
+    parser.add_argument('-b', '--budget', type=float, default=DEFAULT_BUDGET_MS,
+                        help='default budget in milliseconds (default: %(default)s)')
+    parser.add_argument('-o', '--override', action='append', default=[], metavar='DAY=MS',
+                        help='budget for a single day, may be repeated')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='keep the best of this many imports (default: %(default)s)')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='list the slowest imports of days over budget')
+    args = parser.parse_args()
+    budgets = parse_budgets(args.override)
+
+    over = 0
+    for day in args.days:
+        budget = budgets.get(day, args.budget)
+        ms = min(import_time(day) for _ in range(args.repeat)) / 1000
+        status = 'ok' if ms <= budget else 'OVER BUDGET'
+        print(f'day{day:02} {ms:8.2f} ms  budget {budget:8.2f} ms  {status}')
+        if ms > budget:
+            over += 1
+            if args.verbose:
+                for us, name in slowest_imports(day, 5):
+                    print(f'    {us / 1000:8.2f} ms  {name}')
+
+    sys.exit(1 if over else 0)
+
+if __name__ == '__main__':
+    main()
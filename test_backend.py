@@ -0,0 +1,54 @@
+import sys
+
+import pytest
+
+import backend
+
+@pytest.fixture
+def sized(monkeypatch):
+    monkeypatch.setattr(backend, 'override', 'auto')
+    monkeypatch.setattr(backend, 'numpy_available', lambda: True)
+
+    @backend.dispatch(threshold=10, cold_threshold=100)
+    def which(values):
+        return backend.PYTHON
+
+    @which.numpy
+    def which_numpy(values):
+        return backend.NUMPY
+
+    return which
+
+def test_threshold_selects_backend(sized, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'numpy', object())
+    assert sized([ 0 ] * 9) == backend.PYTHON
+    assert sized([ 0 ] * 10) == backend.NUMPY
+
+def test_cold_threshold_applies_until_numpy_is_imported(sized, monkeypatch):
+    monkeypatch.delitem(sys.modules, 'numpy', raising=False)
+    assert sized([ 0 ] * 99) == backend.PYTHON
+    assert sized([ 0 ] * 100) == backend.NUMPY
+
+def test_override(sized, monkeypatch):
+    monkeypatch.setattr(backend, 'override', backend.NUMPY)
+    assert sized([ ]) == backend.NUMPY
+    monkeypatch.setattr(backend, 'override', backend.PYTHON)
+    assert sized([ 0 ] * 1000) == backend.PYTHON
+
+def test_without_numpy_stays_python(sized, monkeypatch):
+    monkeypatch.setattr(backend, 'numpy_available', lambda: False)
+    monkeypatch.setitem(sys.modules, 'numpy', object())
+    assert sized([ 0 ] * 1000) == backend.PYTHON
+
+def test_unregistered_numpy_falls_back(monkeypatch):
+    monkeypatch.setattr(backend, 'override', backend.NUMPY)
+
+    @backend.dispatch(threshold=0, cold_threshold=0)
+    def only_python(values):
+        return backend.PYTHON
+
+    assert only_python([ ]) == backend.PYTHON
+
+def test_python_implementation_is_exposed(sized, monkeypatch):
+    monkeypatch.setattr(backend, 'override', backend.NUMPY)
+    assert sized.python([ ]) == backend.PYTHON
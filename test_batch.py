@@ -0,0 +1,16 @@
+import batch
+import parallel
+
+def test_warm_workers_solve_serially(monkeypatch):
+    monkeypatch.setattr(parallel, 'jobs', 3)
+    batch.warm_up([ 12 ])
+    assert parallel.jobs == 1
+
+def test_run_batch_matches_runner(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel, 'jobs', 3)
+    lines = [ '???.### 1,1,3', '.??..??...?##. 1,1,3', '?###???????? 3,2,1' ]
+    for name, count in (('a.txt', 1), ('b.txt', 3)):
+        (tmp_path / name).write_text('\n'.join(lines[:count]) + '\n')
+    tasks = batch.collect_tasks([ 12 ], None, str(tmp_path))
+    outcomes = list(batch.run_batch(tasks, 2))
+    assert [ outcome.answers for outcome in outcomes ] == [ [ 1, 1 ], [ 15, 522635 ] ]
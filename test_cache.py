@@ -0,0 +1,47 @@
+import importlib
+import os
+import sys
+
+from cache import Cache
+
+def load(tmp_path, monkeypatch, source):
+    (tmp_path / 'cached_day.py').write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop('cached_day', None)
+    return importlib.import_module('cached_day')
+
+def test_round_trip(tmp_path):
+    cache = Cache(tmp_path / 'cache')
+    assert cache.get('key', 'parsed') is None
+    assert cache.put('key', 'parsed', { 'a': [ 1, 2 ] })
+    assert cache.get('key', 'parsed') == { 'a': [ 1, 2 ] }
+
+def test_unpicklable_values_are_not_stored(tmp_path):
+    cache = Cache(tmp_path / 'cache')
+    assert not cache.put('key', 'parsed', lambda: None)
+    assert cache.get('key', 'parsed') is None
+
+def test_key_changes_with_input_and_source(tmp_path, monkeypatch):
+    cache = Cache(tmp_path / 'cache')
+    module = load(tmp_path, monkeypatch, 'def parse(text):\n    return text\n')
+    key = cache.key(module, 'input')
+    assert cache.key(module, 'input') == key
+    assert cache.key(module, 'other input') != key
+
+    path = tmp_path / 'cached_day.py'
+    path.write_text('def parse(text):\n    return text.split()\n')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.key(module, 'input') != key
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = Cache(tmp_path / 'cache', max_bytes=10**6)
+    for i, key in enumerate([ 'a', 'b', 'c' ]):
+        cache.put(key, 'parsed', bytes(1000))
+        os.utime(cache.path(key, 'parsed'), (i, i))
+    # reading refreshes an entry, so b is now the oldest
+    cache.get('a', 'parsed')
+    size = os.path.getsize(cache.path('a', 'parsed'))
+    cache.max_bytes = 2 * size
+    cache.evict()
+    assert [ cache.get(key, 'parsed') is not None for key in 'abc' ] == [ True, False, True ]
@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+import day01
+from day01 import WORDS
+
+def digit(s):
+    return int(s[0]) if s[0].isdigit() else None
+
+def digit_or_word(s):
+    # a '0' digit is falsy here, so only 'zero' counts as 0 in part 2
+    return digit(s) or next((n for n, word in enumerate(WORDS) if s.startswith(word)), None)
+
+def naive(line, convert):
+    values = [ value for value in map(convert, (line[i:] for i in range(len(line)))) if value is not None ]
+    return values[0] * 10 + values[-1]
+
+@pytest.mark.parametrize('line', [ 'two1nine', '7pqrstsixteen', 'xtwone3four', 'oneight2eightwo', '0zero0', 'zero1zero', '5', '1abc2' ])
+def test_examples(line):
+    assert day01.calibration_values(line) == (naive(line, digit), naive(line, digit_or_word))
+
+def test_matches_naive_scan():
+    rng = random.Random(1)
+    pieces = WORDS + list('0123456789') + [ 'x', 'oneight', 'eightwo', 'zerone' ]
+    for _ in range(2000):
+        line = ''.join(rng.choice(pieces)[:rng.randint(1, 5)] for _ in range(rng.randint(1, 8))) + rng.choice('123456789')
+        assert day01.calibration_values(line) == (naive(line, digit), naive(line, digit_or_word)), line
+
+def test_parts_share_one_scan():
+    lines = day01.parse('1abc2\npqr3stu8vwx\ntwo1nine\n')
+    assert (day01.solve_part1(lines), day01.solve_part2(lines)) == (12 + 38 + 11, 12 + 38 + 29)
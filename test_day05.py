@@ -0,0 +1,43 @@
+import random
+
+import day05
+
+def random_almanac(rng, stages=4, span=200):
+    mappings = [ ]
+    for _ in range(stages):
+        cuts = sorted(rng.sample(range(span), 2 * rng.randint(0, 6)))
+        ranges = [ (rng.randrange(span), lo, hi - lo) for lo, hi in zip(cuts[::2], cuts[1::2]) ]
+        mappings.append(day05.Mapping(ranges))
+    return mappings
+
+def stage_by_stage(mappings, value):
+    # each stage's ranges applied in turn, straight from the puzzle text
+    for mapping in mappings:
+        for lo, hi, delta in mapping.pieces:
+            if lo <= value < hi:
+                value += delta
+                break
+    return value
+
+def test_composition_matches_each_stage_in_turn():
+    rng = random.Random(5)
+    for _ in range(200):
+        mappings = random_almanac(rng)
+        location = day05.compose(mappings)
+        for value in range(-5, 260):
+            assert location(value) == stage_by_stage(mappings, value)
+
+def test_min_value_matches_brute_force(monkeypatch):
+    # small blocks, so that queries span whole blocks as well as partial ones
+    monkeypatch.setattr(day05, 'BLOCK', 3)
+    rng = random.Random(50)
+    for _ in range(200):
+        mappings = random_almanac(rng, stages=5, span=400)
+        location = day05.compose(mappings)
+        for _ in range(10):
+            ranges = [ ]
+            for _ in range(rng.randint(1, 3)):
+                lo = rng.randrange(-10, 420)
+                ranges.append((lo, lo + rng.randint(0, 150)))
+            values = [ stage_by_stage(mappings, v) for lo, hi in ranges for v in range(lo, hi) ]
+            assert location.min_value(ranges) == min(values, default=float('inf'))
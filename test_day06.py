@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+import backend
+import day06
+
+def brute_force(time, distance):
+    return sum(hold * (time - hold) > distance for hold in range(time + 1))
+
+def test_ways_to_win_matches_brute_force():
+    for time in range(60):
+        for distance in range(time * time // 4 + 2):
+            assert day06.ways_to_win(time, distance) == brute_force(time, distance), (time, distance)
+
+def near_square_bounds(time, rng):
+    # distances that put time**2 - 4 * distance - 1 on and beside perfect
+    # squares, small and large, where a float square root is least reliable
+    for root in [ 0, 1, 2, 3 ] + [ rng.randrange(1, time) for _ in range(20) ] + [ time - 1, time - 2 ]:
+        for offset in range(-2, 4):
+            distance, remainder = divmod(time * time - root * root - offset, 4)
+            if remainder == 0 and 0 <= distance < 2**60:
+                yield distance
+
+@pytest.mark.parametrize('time', [ 7, 1000, 2**20 + 1, 2**31 - 2, 2**31 - 1, 2**31, 2**32 + 5 ])
+def test_numpy_square_root_correction_is_exact(time):
+    pytest.importorskip('numpy')
+    # one distance past 2**60 sends the whole call back to Python, so the
+    # bounds are checked apart from the rest
+    for distances in (sorted(set(near_square_bounds(time, random.Random(time)))), [ 2**60 - 1 ], [ 2**60 ]):
+        times = [ time ] * len(distances)
+        expected = list(map(day06.ways_to_win, times, distances))
+        assert day06.all_ways_to_win.implementations[backend.NUMPY](times, distances) == expected
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+import day07
+import generators
+import runner
+
+def deal(count, seed, cards='AKQJT2'):
+    # few distinct cards, so equal hands recur within and across runs
+    rng = random.Random(seed)
+    return [ f'{"".join(rng.choices(cards, k=5))} {rng.randint(1, 1000)}\n'.encode() for _ in range(count) ]
+
+def in_memory(lines):
+    hands = day07.parse(b''.join(lines))
+    return day07.solve_part1(hands), day07.solve_part2(hands)
+
+@pytest.mark.parametrize('count, run_length', [ (0, 4), (3, 4), (4, 4), (101, 4), (500, 17), (500, 1000) ])
+def test_external_sort_matches_total_winnings(count, run_length):
+    lines = deal(count, count + run_length)
+    assert day07.external_winnings(lines, run_length) == in_memory(lines)
+
+def test_stream_spills_once_run_length_is_set(tmp_path, monkeypatch):
+    text = generators.gen_day07(300, random.Random(7))
+    path = tmp_path / 'day07.txt'
+    path.write_text(text)
+    monkeypatch.setattr(day07, 'run_length', 32)
+    spilled, spill = [ ], day07.spill
+
+    def counted_spill(*args):
+        spilled.append(spill(*args))
+        return spilled[-1]
+
+    monkeypatch.setattr(day07, 'spill', counted_spill)
+    streamed = [ stage.result for stage in runner.stream(day07, path)[1:] ]
+    assert streamed == list(in_memory(text.encode().splitlines(keepends=True)))
+    # ten runs of 32 hands for each ruleset
+    assert len(spilled) == 20
+
+def test_ranking_totals_match_total_winnings_after_each_hand():
+    accumulator, dealt = day07.Accumulator(), [ ]
+    for line in deal(300, 24, cards='AKJ2'):
+        cards, bid = line.split()
+        dealt.append(line)
+        # few distinct cards, so most hands tie with one dealt before
+        assert accumulator.deal(cards, int(bid)) == in_memory(dealt)
+    assert accumulator.answers() == in_memory(dealt)
+
+def test_ranking_with_equal_keys():
+    ranking, bids = day07.Ranking(), [ 5, 3, 8, 1 ]
+    for count, bid in enumerate(bids, 1):
+        ranking.add(100, bid)
+        # equal keys rank in the order dealt
+        assert ranking.total == sum(rank * b for rank, b in enumerate(bids[:count], 1))
+    # a weaker hand moves every other one up a rank
+    ranking.add(99, 10)
+    assert ranking.total == 10 + 2 * 5 + 3 * 3 + 4 * 8 + 5 * 1
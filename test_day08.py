@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+import day08
+
+def random_network(rng, size):
+    names = [ f'{i:02}{rng.choice("ABZ")}'.encode() for i in range(size) ]
+    moves = [ rng.randrange(2) for _ in range(rng.randint(1, 7)) ]
+    network = day08.Network(moves)
+    successors = { }
+    for name in names:
+        successors[name] = rng.choice(names), rng.choice(names)
+        network.add_node(name, *successors[name])
+    return network, successors
+
+def walk(network, successors, node):
+    # one move at a time; a repeated (node, move) state means no Z ahead
+    seen, steps = set(), 0
+    while True:
+        state = node, steps % len(network.moves)
+        if state in seen:
+            return None
+        seen.add(state)
+        node = successors[node][network.moves[steps % len(network.moves)]]
+        steps += 1
+        if node.endswith(b'Z'):
+            return steps
+
+def test_first_z_matches_naive_walk():
+    rng = random.Random(8)
+    unreachable = 0
+    for _ in range(300):
+        network, successors = random_network(rng, rng.randint(1, 12))
+        for node in successors:
+            expected = walk(network, successors, node)
+            if expected is None:
+                unreachable += 1
+                with pytest.raises(ValueError):
+                    network.first_z(node)
+            else:
+                assert network.first_z(node) == expected
+    assert unreachable
+
+def walk_after(network, successors, node, steps):
+    # states repeat within len(successors) * len(moves) steps, so huge step
+    # counts are cut down to the same place in the cycle they end up in
+    moves, seen, path = network.moves, { }, [ ]
+    state = node, 0
+    while state not in seen:
+        seen[state] = len(path)
+        path.append(state[0])
+        node, k = state
+        state = successors[node][moves[k]], (k + 1) % len(moves)
+    start = seen[state]
+    if steps < len(path):
+        return path[steps]
+    return path[start + (steps - start) % (len(path) - start)]
+
+def test_after_matches_naive_walk():
+    rng = random.Random(25)
+    for _ in range(100):
+        network, successors = random_network(rng, rng.randint(1, 12))
+        for node in successors:
+            for steps in list(range(60)) + [ 10**6 + 3, 10**15 + 7 ]:
+                assert network.after(node, steps) == walk_after(network, successors, node, steps)
@@ -0,0 +1,26 @@
+import random
+
+import pytest
+
+import backend
+import day09
+
+def both(histories, backwards):
+    implementations = day09.sum_extrapolated.implementations
+    return implementations[backend.PYTHON](histories, backwards), implementations[backend.NUMPY](histories, backwards)
+
+@pytest.mark.parametrize('backwards', [ False, True ])
+def test_backends_agree(backwards):
+    pytest.importorskip('numpy')
+    rng = random.Random(9)
+    histories = [ [ rng.randint(-50, 50) for _ in range(rng.randint(1, 25)) ] for _ in range(200) ]
+    python, vectorized = both(histories, backwards)
+    assert python == vectorized
+
+@pytest.mark.parametrize('backwards', [ False, True ])
+def test_long_histories_fall_back_instead_of_overflowing(backwards):
+    pytest.importorskip('numpy')
+    # binomial weights of 70 values pass int64, zero values or not
+    histories = [ [ 0 ] * 70, [ 0 ] * 69 + [ 1 ], [ 2**62 ] * 3 ]
+    python, vectorized = both(histories, backwards)
+    assert python == vectorized == sum(map(day09.extrapolate, (h[::-1] if backwards else h for h in histories)))
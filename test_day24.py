@@ -0,0 +1,59 @@
+import itertools
+import random
+from fractions import Fraction
+
+import pytest
+
+import backend
+import day24
+from day24 import HI, LO, Stone
+
+def crosses_exactly(a, b):
+    # the crossing worked out in fractions, straight from the two paths
+    (ax, ay, _), (avx, avy, _), (bx, by, _), (bvx, bvy, _) = a.p, a.v, b.p, b.v
+    d = avx * bvy - avy * bvx
+    if d == 0:
+        return False
+    ta = Fraction((bx - ax) * bvy - (by - ay) * bvx, d)
+    tb = Fraction((bx - ax) * avy - (by - ay) * avx, d)
+    return ta > 0 and tb > 0 and LO <= ax + avx * ta <= HI and LO <= ay + avy * ta <= HI
+
+def boundary_stones(count, seed):
+    # stones on and around the edges of the test area with small velocities,
+    # so that many paths cross exactly on an edge or a corner, or just past it
+    rng = random.Random(seed)
+    near = [ LO - 3, LO - 1, LO, LO + 1, LO + 2, HI - 2, HI - 1, HI, HI + 1, HI + 3 ]
+    stones = [ ]
+    while len(stones) < count:
+        v = (rng.randint(-3, 3), rng.randint(-3, 3), 1)
+        if v[:2] != (0, 0):
+            stones.append(Stone((rng.choice(near), rng.choice(near), 0), v))
+    return stones
+
+def expected(stones):
+    return sum(crosses_exactly(a, b) for a, b in itertools.combinations(stones, 2))
+
+CORNER = [ Stone((LO - 1, HI - 1, 0), (1, 1, 0)), Stone((LO + 1, HI - 1, 0), (-1, 1, 0)),
+           Stone((HI, LO - 3, 0), (0, 1, 0)), Stone((HI - 1, LO, 0), (3, 1, 0)) ]
+
+@pytest.mark.parametrize('stones', [ CORNER, boundary_stones(150, 1), boundary_stones(150, 2) ])
+def test_backends_agree_on_the_boundary(stones):
+    pytest.importorskip('numpy')
+    implementations = day24.solve_part1.implementations
+    count = expected(stones)
+    assert implementations[backend.PYTHON](stones) == count
+    assert implementations[backend.NUMPY](stones) == count
+
+def test_backends_agree_on_generated_input():
+    pytest.importorskip('numpy')
+    import generators
+
+    stones = day24.parse(generators.gen_day24(120, random.Random(24)).encode())
+    implementations = day24.solve_part1.implementations
+    assert implementations[backend.NUMPY](stones) == implementations[backend.PYTHON](stones) == expected(stones)
+
+def test_numpy_falls_back_beyond_int64():
+    pytest.importorskip('numpy')
+    stones = [ Stone((2**62, LO, 0), (-2**40, 1, 0)), Stone((LO, LO + 1, 0), (1, 0, 0)),
+               Stone((LO + 5, HI, 0), (0, -1, 0)) ]
+    assert day24.solve_part1.implementations[backend.NUMPY](stones) == expected(stones)
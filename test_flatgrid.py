@@ -0,0 +1,39 @@
+from flatgrid import DOWN, LEFT, RIGHT, UP, FlatGrid
+
+ROWS = [ 'abc', 'def' ]
+
+def test_border_surrounds_cells():
+    grid = FlatGrid(ROWS, border='#')
+    assert (grid.rows, grid.cols, grid.width) == (2, 3, 5)
+    assert bytes(grid.cells) == b'######abc##def######'
+
+def test_index_and_coord_round_trip():
+    for border in (None, '#'):
+        grid = FlatGrid(ROWS, border=border)
+        for r in range(grid.rows):
+            for c in range(grid.cols):
+                i = grid.index(r, c)
+                assert grid[i] == ord(ROWS[r][c])
+                assert grid.coord(i) == (r, c)
+
+def test_stepping_off_the_edge_lands_on_the_border():
+    grid = FlatGrid(ROWS, border='#')
+    left, right, up, down = grid.offsets
+    assert grid[grid.index(0, 0) + left] == ord('#')
+    assert grid[grid.index(0, 2) + right] == ord('#')
+    assert grid[grid.index(0, 1) + up] == ord('#')
+    assert grid[grid.index(1, 1) + down] == ord('#')
+    assert grid.coord(grid.index(0, 0) + up) == (-1, 0)
+
+def test_rows_columns_and_edges():
+    grid = FlatGrid(ROWS, border='#')
+    assert grid.row(1) == b'def'
+    assert grid.column(2) == b'cf'
+    assert [ bytes(grid.cells[s]) for s in grid.edge_slices(RIGHT) ] == [ b'cba', b'fed' ]
+    assert [ bytes(grid.cells[s]) for s in grid.edge_slices(DOWN) ] == [ b'da', b'eb', b'fc' ]
+    assert [ bytes(grid.cells[s]) for s in grid.edge_slices(LEFT) ] == [ b'abc', b'def' ]
+    assert [ bytes(grid.cells[s]) for s in grid.edge_slices(UP) ] == [ b'ad', b'be', b'cf' ]
+
+def test_find():
+    grid = FlatGrid(ROWS, border='#')
+    assert grid.coord(grid.find('e')) == (1, 1)
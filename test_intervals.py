@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from intervals import IntervalSet, coalesce
+
+def members(interval_set):
+    return { n for lo, hi in interval_set.ranges() for n in range(lo, hi) }
+
+def random_set(rng):
+    ranges = [ ]
+    for _ in range(rng.randint(0, 6)):
+        lo = rng.randint(0, 40)
+        ranges.append((lo, lo + rng.randint(-2, 8)))
+    return IntervalSet(ranges)
+
+def test_coalesce_merges_touching_and_drops_empty():
+    assert coalesce([ (0, 2), (2, 4), (5, 5), (6, 9), (7, 8) ]) == [ 0, 4, 6, 9 ]
+
+@pytest.mark.parametrize('seed', range(20))
+def test_operations_match_python_sets(seed):
+    rng = random.Random(seed)
+    a, b = random_set(rng), random_set(rng)
+    for result, expected in ((a & b, members(a) & members(b)), (a - b, members(a) - members(b))):
+        assert members(result) == expected
+        assert result.size() == len(expected)
+        # still sorted, disjoint and non-touching
+        assert result.bounds == coalesce(result.ranges())
+
+def test_min_and_truth():
+    assert not IntervalSet()
+    assert IntervalSet([ (5, 9), (1, 3) ]).min() == 1
+    assert not IntervalSet([ (1, 4) ]) - IntervalSet([ (0, 10) ])
@@ -0,0 +1,34 @@
+import pytest
+
+import parallel
+from instrument import counters
+
+def weighted(shared, i):
+    return shared[i] * i
+
+def counted(shared, i):
+    if counters.enabled:
+        counters.add('items')
+        counters.add('weight', shared[i])
+    return shared[i]
+
+@pytest.mark.parametrize('jobs', [ 1, 2, 3 ])
+def test_map_reduce_matches_serial(jobs, monkeypatch):
+    monkeypatch.setattr(parallel, 'jobs', jobs)
+    values = list(range(100, 0, -1))
+    assert parallel.map_reduce(weighted, values, len(values)) == sum(v * i for i, v in enumerate(values))
+    assert parallel.map_reduce(weighted, values, len(values), reduce=max) == max(v * i for i, v in enumerate(values))
+
+def test_map_reduce_with_fewer_items_than_workers(monkeypatch):
+    monkeypatch.setattr(parallel, 'jobs', 4)
+    assert parallel.map_reduce(weighted, [ 5, 7 ], 2) == 7
+
+@pytest.mark.parametrize('jobs', [ 1, 2 ])
+def test_worker_counters_reach_the_caller(jobs, monkeypatch):
+    monkeypatch.setattr(parallel, 'jobs', jobs)
+    monkeypatch.setattr(counters, 'enabled', True)
+    counters.take()
+    counters.add('before')
+    values = list(range(1, 41))
+    assert parallel.map_reduce(counted, values, len(values)) == sum(values)
+    assert counters.take() == { 'before': 1, 'items': 40, 'weight': sum(values) }
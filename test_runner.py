@@ -0,0 +1,19 @@
+import random
+
+import pytest
+
+import generators
+import runner
+
+STREAMING = [ day for day in runner.DAYS if runner.streams(runner.load_day(day)) ]
+
+@pytest.mark.parametrize('day', STREAMING)
+def test_stream_matches_solve(day, tmp_path):
+    module = runner.load_day(day)
+    size, generate = generators.GENERATORS[day]
+    text = generate(max(size // 10, 4), random.Random(day))
+    path = tmp_path / f'day{day:02}.txt'
+    path.write_text(text)
+    streamed = [ stage.result for stage in runner.stream(module, path)[1:] ]
+    solved = [ stage.result for stage in runner.solve(module, text)[1:] ]
+    assert streamed == solved
@@ -0,0 +1,35 @@
+import pytest
+
+import tokens
+
+@pytest.mark.parametrize('text', [
+    'a\nb\n\nc\n',
+    'a\nb\n\nc',
+    'a\nb\n\nc\n\n\n',
+    '\na\nb\n\nc\n',
+    'a\r\nb\r\n\r\nc\r\n',
+    'a\r\nb\r\n\r\nc',
+])
+def test_sections(text, tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_bytes(text.encode())
+    assert tokens.sections(text) == [ b'a\nb', b'c' ]
+    assert list(tokens.mapped_sections(path)) == [ b'a\nb', b'c' ]
+
+def test_mapped_sections_of_empty_file(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_bytes(b'')
+    assert list(tokens.mapped_sections(path)) == [ ]
+
+def test_integers():
+    assert tokens.integers('x=3, y=-12\n7') == [ 3, -12, 7 ]
+    # a hyphen that is not a sign falls back to the regex
+    assert tokens.integers(b'seed-to-soil 5-3') == [ 5, -3 ]
+
+def test_integer_lines():
+    assert tokens.integer_lines('1 2 3\n-4 5\n') == [ [ 1, 2, 3 ], [ -4, 5 ] ]
+
+def test_rows():
+    assert tokens.rows('1 2 3\n4 5 6', 3) == [ (1, 2, 3), (4, 5, 6) ]
+    with pytest.raises(ValueError):
+        tokens.rows('1 2 3 4', 3)
@@ -0,0 +1,72 @@
+#! /usr/bin/env python3
+
+import argparse
+import os
+import sys
+import time
+
+import runner
+
+class Tail:
+    # The complete lines appended to a file since the last read. A trailing
+    # line without its newline is held back until the rest of it arrives.
+    def __init__(self, path):
+        self.path = path
+        self.inode = None
+        self.offset = 0
+        self.partial = b''
+
+    def restarted(self, stat):
+        # truncated, or replaced by a new file as editors do when saving
+        return self.inode is not None and (stat.st_ino != self.inode or stat.st_size < self.offset)
+
+    def read(self, stat):
+        if stat.st_size == self.offset:
+            return []
+        with open(self.path, 'rb') as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        self.offset += len(data)
+        lines = (self.partial + data).split(b'\n')
+        self.partial = lines.pop()
+        return lines
+
+def watch(module, path, interval):
+    tail, accumulator = Tail(path), module.Accumulator()
+    while True:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            time.sleep(interval)
+            continue
+        if tail.restarted(stat):
+            print(f'{path} was truncated or replaced, starting over', file=sys.stderr)
+            tail, accumulator = Tail(path), module.Accumulator()
+        lines = tail.read(stat)
+        if lines:
+            wall = time.perf_counter()
+            accumulator.feed(lines)
+            wall = time.perf_counter() - wall
+            part1, part2 = accumulator.answers()
+            print(f'Part 1: {part1}  Part 2: {part2}  (+{len(lines)} lines in {wall * 1000:.3f} ms)', flush=True)
+        time.sleep(interval)
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-solve a growing input, processing only appended lines')
+    parser.add_argument('day', type=int, choices=runner.DAYS, metavar='DAY')
+    parser.add_argument('input', nargs='?', help='input file (default: input/dayNN.txt)')
+    parser.add_argument('-n', '--interval', type=float, default=0.25,
+                        help='seconds between checks for new data (default: %(default)s)')
+    args = parser.parse_args()
+
+    module = runner.load_day(args.day)
+    if not hasattr(module, 'Accumulator'):
+        sys.exit(f'day {args.day} cannot be solved incrementally')
+    try:
+        watch(module, args.input or f'input/day{args.day:02}.txt', args.interval)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()